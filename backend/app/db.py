@@ -20,10 +20,16 @@ if not DATABASE_URL:
     DATABASE_URL = f"sqlite:///{DB_PATH.as_posix()}"
     # ...existing code...
 
+# Pool sized for the threadpool FastAPI runs sync handlers in (default pool_size=5 +
+# max_overflow=10 queues up under load); pre-ping drops connections that died while idle
+POOL_OPTIONS = dict(pool_size=20, max_overflow=10, pool_timeout=30, pool_recycle=3600, pool_pre_ping=True)
+
 # sqlite needs check_same_thread=False for FastAPI
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+    # in-memory sqlite uses a single shared connection, not a QueuePool
+    **({} if ":memory:" in DATABASE_URL else POOL_OPTIONS),
     future=True,
 )
 
@@ -35,5 +41,9 @@ def get_db():
     db = SessionLocal()
     try:
         yield db
+    except Exception:
+        # a handler that raised after partial work must not leave its transaction open
+        db.rollback()
+        raise
     finally:
         db.close()
@@ -15,8 +15,10 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://127.0.0.1:5173", "*"],
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"],
     allow_headers=["*"],
+    # read by tus clients resuming /student/submissions/tus uploads
+    expose_headers=["Location", "Upload-Offset", "Upload-Length", "Tus-Resumable", "X-Submission-Id", "X-Next-Cursor"],
 )
 
 def mount_router(modname: str) -> None:
@@ -82,3 +84,27 @@ def root():
 @app.get("/_routes")
 def _routes():
     return [{"path": rt.path, "name": rt.name} for rt in app.routes]
+
+if __name__ == "__main__":
+    # Production-style entrypoint: `python -m app.main`
+    import os
+    import uvicorn
+
+    try:
+        import uvloop  # noqa: F401  (not available on Windows)
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+
+    workers = int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1))
+    # The workers read it too: utils.ttl_cache turns its caches off under several workers
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "8000")),
+        loop=loop,
+        http="httptools",
+        workers=workers,
+    )
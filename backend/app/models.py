@@ -1,8 +1,8 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import Integer, Float, Text, DateTime, String, func, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Integer, Float, Text, DateTime, String, func, ForeignKey, CheckConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship, foreign
 from app.db import Base
 
 # -------- users --------
@@ -54,6 +54,12 @@ class Course(Base):
     
     # Relationships
     enrollments: Mapped[List["CourseEnrollment"]] = relationship("CourseEnrollment", back_populates="course")
+    # department_id has no FK constraint in the schema, so the join is spelled out (read-only)
+    department: Mapped[Optional["Department"]] = relationship(
+        "Department",
+        primaryjoin=lambda: foreign(Course.department_id) == Department.department_id,
+        viewonly=True,
+    )
 
 class CourseEnrollment(Base):
     __tablename__ = "CourseEnrollment"
@@ -68,6 +74,12 @@ class CourseEnrollment(Base):
     # Relationships
     course: Mapped["Course"] = relationship("Course", back_populates="enrollments")
 
+# Enrollment existence checks (student_id, course_id) and per-student lookups (leading column).
+# Not unique: a Dropped enrollment may sit next to a new Active one for the same course.
+Index("ix_enrollment_student_course", CourseEnrollment.student_id, CourseEnrollment.course_id)
+# Most recent enrollments first (ORDER BY enrolled_at DESC LIMIT n).
+Index("ix_enrollment_enrolled_at", CourseEnrollment.enrolled_at.desc())
+
 class Assignment(Base):
     __tablename__ = "Assignment"
     assignment_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -91,9 +103,22 @@ class Assignment(Base):
     doctor: Mapped["Doctor"] = relationship("Doctor", back_populates="assignments")
     submissions: Mapped[List["Submission"]] = relationship("Submission", back_populates="assignment")
 
+# Doctor-scoped submission lists: assignments created by a doctor
+Index("ix_assignment_created_by", Assignment.created_by)
+
 # -------- people --------
+STUDENT_YEAR_LEVELS = ("First", "Second", "Third", "Fourth", "Fifth")
+STUDENT_STATUSES = ("Active", "Inactive", "Graduated", "Suspended")
+
+def _in_list(column: str, values: tuple) -> str:
+    return f"{column} IN ({', '.join(repr(v) for v in values)})"
+
 class Student(Base):
     __tablename__ = "Student"
+    __table_args__ = (
+        CheckConstraint(_in_list("year_level", STUDENT_YEAR_LEVELS), name="ck_student_year_level"),
+        CheckConstraint(_in_list("status", STUDENT_STATUSES), name="ck_student_status"),
+    )
     student_id:     Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     student_number: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
     full_name:      Mapped[str] = mapped_column(Text, nullable=False)
@@ -105,7 +130,7 @@ class Student(Base):
     current_status: Mapped[Optional[str]] = mapped_column(Text)
     notes:          Mapped[Optional[str]] = mapped_column(Text)
     created_at:     Mapped[datetime] = mapped_column(DateTime, server_default=func.current_timestamp(), nullable=False)
-    user_id:        Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    user_id:        Mapped[Optional[int]] = mapped_column(Integer, nullable=True, unique=True, index=True)
     
     # New fields for enhanced student profile
     gpa:            Mapped[Optional[float]] = mapped_column(Float, nullable=True)
@@ -116,6 +141,9 @@ class Student(Base):
     emergency_contact_relationship: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     emergency_contact_phone: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+# list_students filters on year_level/status and orders by newest first
+Index("ix_student_list_filter", Student.year_level, Student.status, Student.created_at.desc())
+
 class Doctor(Base):
     __tablename__ = "Doctor"
     doctor_id:     Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -146,7 +174,21 @@ class Submission(Base):
     
     # Relationships
     assignment: Mapped["Assignment"] = relationship("Assignment", back_populates="submissions")
-    feedback: Mapped[List["SubmissionFeedback"]] = relationship("SubmissionFeedback", back_populates="submission")
+    # One-to-one: SubmissionFeedback.submission_id is UNIQUE
+    feedback: Mapped[Optional["SubmissionFeedback"]] = relationship("SubmissionFeedback", back_populates="submission", uselist=False)
+
+# Student submission listings/stats: WHERE student_id ... ORDER BY submitted_at DESC
+Index(
+    "ix_submission_student_submitted",
+    Submission.student_id, Submission.submitted_at.desc(), Submission.status, Submission.assignment_id,
+)
+# Per-student submission lookup when LEFT JOINed from Assignment
+Index("ix_submission_assignment_student", Submission.assignment_id, Submission.student_id)
+# Doctor/admin submission list: WHERE status ... ORDER BY submitted_at DESC (covers stats GROUP BY status)
+Index(
+    "ix_submission_status_submitted",
+    Submission.status, Submission.submitted_at.desc(), Submission.student_id, Submission.assignment_id,
+)
 
 class SubmissionFeedback(Base):
     __tablename__ = "SubmissionFeedback"
@@ -39,3 +39,4 @@ class SubmissionRead(BaseModel):
     grade: Optional[float] = None
     feedback: Optional[str] = None
     gradedAt: Optional[datetime] = None
+    totalCount: Optional[int] = None  # listing only: rows matching the filters, ignoring limit/offset
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Migration script to create the query-path indexes declared in app/models.py
+Run this script against an existing database; new databases get them from init_db.py
+"""
+
+import sqlite3
+from pathlib import Path
+
+# (name, table, columns, unique)
+INDEXES = [
+    # Student list: WHERE year_level/status ... ORDER BY created_at DESC
+    ("ix_student_list_filter", "Student", "year_level, status, created_at DESC", False),
+    # Student <-> User is 1:1; resolved on every student-role request
+    ("ix_Student_user_id", "Student", "user_id", True),
+    # Enrollment checks: WHERE student_id [AND course_id] (not unique: Dropped + Active may coexist)
+    ("ix_enrollment_student_course", "CourseEnrollment", "student_id, course_id", False),
+    # Most recent enrollments first: ORDER BY enrolled_at DESC LIMIT n (debug_enrollment_flow.py)
+    ("ix_enrollment_enrolled_at", "CourseEnrollment", "enrolled_at DESC", False),
+    # Student submissions: WHERE student_id ... ORDER BY submitted_at DESC (covers stats too)
+    ("ix_submission_student_submitted", "Submission", "student_id, submitted_at DESC, status, assignment_id", False),
+    # Doctor-scoped submission lists: EXISTS (... Assignment.created_by = doctor)
+    ("ix_assignment_created_by", "Assignment", "created_by", False),
+    # Available-assignments LEFT JOIN Submission ON (assignment_id, student_id)
+    ("ix_submission_assignment_student", "Submission", "assignment_id, student_id", False),
+    # Doctor/admin list: WHERE status ... ORDER BY submitted_at DESC (covers stats GROUP BY status)
+    ("ix_submission_status_submitted", "Submission", "status, submitted_at DESC, student_id, assignment_id", False),
+]
+
+# Substring search for list_students: an FTS5 trigram index answers '%term%' lookups
+# without scanning Student. External-content table kept in sync by triggers.
+STUDENT_SEARCH_DDL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS StudentSearch USING fts5(
+        full_name, student_number, email,
+        content='Student', content_rowid='student_id', tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS student_search_ai AFTER INSERT ON Student BEGIN
+        INSERT INTO StudentSearch(rowid, full_name, student_number, email)
+        VALUES (new.student_id, new.full_name, new.student_number, new.email);
+    END;
+    CREATE TRIGGER IF NOT EXISTS student_search_ad AFTER DELETE ON Student BEGIN
+        INSERT INTO StudentSearch(StudentSearch, rowid, full_name, student_number, email)
+        VALUES ('delete', old.student_id, old.full_name, old.student_number, old.email);
+    END;
+    CREATE TRIGGER IF NOT EXISTS student_search_au AFTER UPDATE OF full_name, student_number, email ON Student BEGIN
+        INSERT INTO StudentSearch(StudentSearch, rowid, full_name, student_number, email)
+        VALUES ('delete', old.student_id, old.full_name, old.student_number, old.email);
+        INSERT INTO StudentSearch(rowid, full_name, student_number, email)
+        VALUES (new.student_id, new.full_name, new.student_number, new.email);
+    END;
+    INSERT INTO StudentSearch(StudentSearch) VALUES ('rebuild');
+"""
+
+# Same for the assignment title search in the doctor/admin submissions list
+ASSIGNMENT_SEARCH_DDL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS AssignmentSearch USING fts5(
+        title, content='Assignment', content_rowid='assignment_id', tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS assignment_search_ai AFTER INSERT ON Assignment BEGIN
+        INSERT INTO AssignmentSearch(rowid, title) VALUES (new.assignment_id, new.title);
+    END;
+    CREATE TRIGGER IF NOT EXISTS assignment_search_ad AFTER DELETE ON Assignment BEGIN
+        INSERT INTO AssignmentSearch(AssignmentSearch, rowid, title) VALUES ('delete', old.assignment_id, old.title);
+    END;
+    CREATE TRIGGER IF NOT EXISTS assignment_search_au AFTER UPDATE OF title ON Assignment BEGIN
+        INSERT INTO AssignmentSearch(AssignmentSearch, rowid, title) VALUES ('delete', old.assignment_id, old.title);
+        INSERT INTO AssignmentSearch(rowid, title) VALUES (new.assignment_id, new.title);
+    END;
+    INSERT INTO AssignmentSearch(AssignmentSearch) VALUES ('rebuild');
+"""
+
+def create_indexes():
+    # Get the database path
+    db_path = Path(__file__).parent.parent / "database" / "dentist.db"
+    
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        return False
+    
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        
+        for name, table, columns, unique in INDEXES:
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            cursor.execute(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({columns})")
+            print(f"✅ {name} on {table}({columns})")
+        
+        # Trigram tokenizer needs SQLite >= 3.34; skip (search falls back to LIKE) on older builds
+        try:
+            cursor.executescript(STUDENT_SEARCH_DDL)
+            print("✅ StudentSearch (FTS5 trigram) on Student(full_name, student_number, email)")
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  StudentSearch not created ({e}); student search will use LIKE scans")
+        try:
+            cursor.executescript(ASSIGNMENT_SEARCH_DDL)
+            print("✅ AssignmentSearch (FTS5 trigram) on Assignment(title)")
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  AssignmentSearch not created ({e}); submission search will use LIKE scans")
+        
+        # Refresh planner statistics so the new indexes are picked up
+        cursor.execute("ANALYZE")
+        conn.commit()
+        return True
+        
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+        return False
+    finally:
+        if conn:
+            conn.close()
+
+if __name__ == "__main__":
+    print("Creating indexes...")
+    if create_indexes():
+        print("\n🎉 Migration completed successfully!")
+    else:
+        print("\n💥 Migration failed!")
@@ -11,6 +11,7 @@ from sqlalchemy import and_, or_
 from app.db import get_db
 from app import models
 from app.deps import get_current_active_user
+from utils.ttl_cache import assignment_window_cache, submission_list_cache
 from app.schemas.assignment import (
     AssignmentCreate,
     AssignmentRead,
@@ -287,6 +288,9 @@ def update_assignment(
         assignment.updated_at = datetime.utcnow()
         
         db.commit()
+        # Submission lists show the assignment title and department; uploads check its window
+        submission_list_cache.clear()
+        assignment_window_cache.pop(assignment_id)
         db.refresh(assignment)
         
         # Reload with relationships
@@ -338,6 +342,8 @@ def delete_assignment(
             # Hard delete - only if no submissions exist
             db.delete(assignment)
             db.commit()
+        # A cached window would keep accepting uploads for a deleted assignment
+        assignment_window_cache.pop(assignment_id)
     
     except HTTPException:
         raise
@@ -6,7 +6,7 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 
 from app.db import get_db
@@ -707,7 +707,9 @@ def get_student_enrollments(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
     
     print(f"[DEBUG] Looking for enrollments for student_id: {student_id}")
-    enrollments = db.query(models.CourseEnrollment).filter(
+    enrollments = db.query(models.CourseEnrollment).options(
+        joinedload(models.CourseEnrollment.course).joinedload(models.Course.department)
+    ).filter(
         models.CourseEnrollment.student_id == student_id
     ).all()
     
@@ -717,16 +719,12 @@ def get_student_enrollments(
     
     result = []
     for enrollment in enrollments:
-        # Get course details
-        course = db.query(models.Course).filter(models.Course.course_id == enrollment.course_id).first()
+        # Course and department arrive with the enrollment (joined eager load)
+        course = enrollment.course
         if not course:
             continue
             
-        # Get department name
-        department = db.query(models.Department).filter(
-            models.Department.department_id == course.department_id
-        ).first()
-        department_name = department.name if department else "Unknown"
+        department_name = course.department.name if course.department else "Unknown"
         
         result.append(CourseEnrollmentResponse(
             enrollment_id=enrollment.enrollment_id,
@@ -756,22 +754,20 @@ def get_course_enrollments(
 ):
     """Get all enrollments for a course"""
     
-    enrollments = db.query(models.CourseEnrollment).filter(
+    enrollments = db.query(models.CourseEnrollment).options(
+        joinedload(models.CourseEnrollment.course).joinedload(models.Course.department)
+    ).filter(
         models.CourseEnrollment.course_id == course_id
     ).all()
     
     result = []
     for enrollment in enrollments:
-        # Get course details
-        course = db.query(models.Course).filter(models.Course.course_id == enrollment.course_id).first()
+        # Course and department arrive with the enrollment (joined eager load)
+        course = enrollment.course
         if not course:
             continue
             
-        # Get department name
-        department = db.query(models.Department).filter(
-            models.Department.department_id == course.department_id
-        ).first()
-        department_name = department.name if department else "Unknown"
+        department_name = course.department.name if course.department else "Unknown"
         
         result.append(CourseEnrollmentResponse(
             enrollment_id=enrollment.enrollment_id,
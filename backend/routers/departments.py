@@ -11,6 +11,7 @@ from sqlalchemy.exc import IntegrityError
 from app.db import get_db
 from app import models
 from app.deps import get_current_active_user
+from utils.ttl_cache import submission_list_cache
 from app.schemas.department import (
     DepartmentCreate,
     DepartmentUpdate,
@@ -275,6 +276,8 @@ def update_department(
         _touch_updated(dept)
 
         db.commit()
+        # Submission lists show the department name
+        submission_list_cache.clear()
         db.refresh(dept)
         return _to_read(dept)
 
@@ -317,6 +320,7 @@ def delete_department(
         # Hard delete
         db.delete(dept)
         db.commit()
+        submission_list_cache.clear()
         return
 
     except HTTPException:
@@ -13,6 +13,7 @@ from sqlalchemy import text
 from app.db import get_db
 from app import models
 from app.deps import get_current_active_user
+from utils.ttl_cache import submission_list_cache
 
 router = APIRouter(prefix="/doctor", tags=["doctor"])
 
@@ -90,7 +91,8 @@ def _submission_is_assigned_to_doctor(sub: models.Submission, doctor_user_id: in
     enforce that this doctor can only manage their own items. Works dynamically:
     - Prefer Submission.doctor_id / Submission.assigned_doctor_id / Submission.reviewer_id
     - Else check Assignment.doctor_id / Assignment.reviewer_id (if available)
-    If none of these columns exist, return True (can't enforce).
+    - Else the doctor who created the assignment (Assignment.created_by -> Doctor.user_id)
+    Same rule as routers/submissions.py. If none of these columns exist, return True (can't enforce).
     """
     # Direct link on Submission
     for col in ("doctor_id", "assigned_doctor_id", "reviewer_id"):
@@ -103,14 +105,23 @@ def _submission_is_assigned_to_doctor(sub: models.Submission, doctor_user_id: in
             if _has_attr(sub.assignment, col):
                 return getattr(sub.assignment, col) == doctor_user_id
 
+    # Then the assignment's creator, as in the list filter
+    if _has_attr(models.Assignment, "created_by"):
+        assignment = sub.assignment
+        return (
+            assignment is not None
+            and assignment.doctor is not None
+            and assignment.doctor.user_id == doctor_user_id
+        )
+
     # Could not determine ownership -> allow (schema doesn't provide linkage)
     return True
 
 def _doctor_filter_sql() -> Tuple[str, str]:
     """
     For listing via raw SQL, return a tuple (clause, param_key) to restrict by doctor
-    if model columns exist. Checks common column names on Submission/Assignment.
-    Returns ("", "") if no suitable column exists.
+    if model columns exist. Checks common column names on Submission/Assignment, then
+    the assignment's creator. Returns ("", "") if no suitable column exists.
     """
     # Prefer Submission columns
     if _has_attr(models.Submission, "doctor_id"):
@@ -126,6 +137,13 @@ def _doctor_filter_sql() -> Tuple[str, str]:
     if _has_attr(models.Assignment, "reviewer_id"):
         return " AND a.reviewer_id = :docid ", "docid"
 
+    # Then the doctor who created the assignment
+    if _has_attr(models.Assignment, "created_by"):
+        return (
+            " AND EXISTS (SELECT 1 FROM Doctor dr WHERE dr.doctor_id = a.created_by AND dr.user_id = :docid) ",
+            "docid",
+        )
+
     return "", ""  # no filter possible
 
 # ---- Routes -----------------------------------------------------------------
@@ -176,8 +194,8 @@ def list_submissions_for_review(
             pass
 
     # dynamic doctor filter (if columns exist)
-    doctor_clause, doctor_param = _doctor_filter_sql()
-    doctor_bind = {doctor_param: current_user.id} if (mine_only and doctor_param) else {}
+    doctor_clause, doctor_param = _doctor_filter_sql() if mine_only else ("", "")
+    doctor_bind = {doctor_param: current_user.id} if doctor_param else {}
 
     # optional feedback join/columns
     fb_select = ", fb.grade AS grade, fb.feedback_text AS feedback_text" if include_feedback else ""
@@ -362,6 +380,7 @@ def review_submission(
         _touch_updated(sub)
 
         db.commit()
+        submission_list_cache.clear()
         db.refresh(sub)
         db.refresh(fb)
 
@@ -12,6 +12,7 @@ from sqlalchemy.exc import IntegrityError
 from app.db import get_db
 from app import models
 from app.deps import get_current_active_user
+from utils.ttl_cache import submission_list_cache
 
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
@@ -220,6 +221,7 @@ def upsert_feedback(
             db.add(fb)
 
         db.commit()
+        submission_list_cache.clear()
         db.refresh(fb)
         return UpsertResponse(ok=True, feedback=_to_read(fb))
 
@@ -271,6 +273,7 @@ def update_feedback(
 
         _touch_updated(fb)
         db.commit()
+        submission_list_cache.clear()
         db.refresh(fb)
         return _to_read(fb)
 
@@ -310,6 +313,7 @@ def delete_feedback(
     try:
         db.delete(fb)
         db.commit()
+        submission_list_cache.clear()
         return
     except HTTPException:
         raise
@@ -5,7 +5,9 @@ from typing import Optional, List
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import select, update, text, column
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 import io
@@ -40,6 +42,9 @@ class StudentUpdate(BaseModel):
     notes: Optional[str] = Field(None, description="Additional notes")
 
 class StudentResponse(BaseModel):
+    # Build the validator/serializer at import rather than on the first list_students call
+    model_config = ConfigDict(from_attributes=True, defer_build=False)
+
     student_id: int
     student_number: str
     full_name: str
@@ -59,19 +64,109 @@ class BulkImportResponse(BaseModel):
 
 # ---- Helpers ----------------------------------------------------------------
 
+_DOCTOR_ROLES = frozenset({"doctor", "admin"})
+
 def _require_doctor(user: models.User):
-    if (user.role or "").lower() not in {"doctor", "admin"}:
+    if (user.role or "").lower() not in _DOCTOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Doctor or admin role required")
 
+def _doctor_user(current_user: models.User = Depends(get_current_active_user)) -> models.User:
+    """Dependency form of _require_doctor shared by every route in this module."""
+    _require_doctor(current_user)
+    return current_user
+
+# Pre-flight checks for a clean 400; the Student table enforces the same sets via CHECK constraints
+_YEAR_LEVELS = frozenset(models.STUDENT_YEAR_LEVELS)
+_STATUSES = frozenset(models.STUDENT_STATUSES)
+
 def _validate_year_level(year_level: str):
-    valid_levels = {"First", "Second", "Third", "Fourth", "Fifth"}
-    if year_level not in valid_levels:
-        raise HTTPException(status_code=400, detail=f"Invalid year level. Must be one of: {', '.join(valid_levels)}")
+    if year_level not in _YEAR_LEVELS:
+        raise HTTPException(status_code=400, detail=f"Invalid year level. Must be one of: {', '.join(models.STUDENT_YEAR_LEVELS)}")
 
 def _validate_status(status: str):
-    valid_statuses = {"Active", "Inactive", "Graduated", "Suspended"}
-    if status not in valid_statuses:
-        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+    if status not in _STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {', '.join(models.STUDENT_STATUSES)}")
+
+# StudentUpdate fields backed by NOT NULL columns: an explicit null or blank is a 400
+_REQUIRED_UPDATE_FIELDS = ("student_number", "full_name", "year_level", "status")
+
+# Rows added per commit during bulk import; bounds the pending set in the session
+_IMPORT_CHUNK_SIZE = 500
+
+def _cell(parts: List[str], idx: int) -> Optional[str]:
+    """Return the stripped field at ``idx`` or None when missing/blank."""
+    if idx >= len(parts):
+        return None
+    value = parts[idx].strip()
+    return value or None
+
+# Columns backing StudentResponse, for endpoints that don't need full ORM rows
+_RESPONSE_COLUMNS = (
+    models.Student.student_id,
+    models.Student.student_number,
+    models.Student.full_name,
+    models.Student.email,
+    models.Student.phone,
+    models.Student.year_level,
+    models.Student.status,
+    models.Student.graduation_year,
+    models.Student.notes,
+    models.Student.created_at,
+)
+
+def _to_response(student) -> StudentResponse:
+    # Accepts a Student entity or a Row selected from _RESPONSE_COLUMNS
+    return StudentResponse.model_validate(student)
+
+# Whether the StudentSearch FTS5 trigram table (see create_indexes.py) exists. Only a hit
+# is kept: until then each search probes again, so running create_indexes.py needs no restart
+_student_search_fts = False
+
+def _search_filter(db: Session, search: str):
+    """Substring match on name/number/email, served by the trigram index when available."""
+    global _student_search_fts
+    # Trigrams need at least 3 characters; shorter terms use the plain ILIKE scan
+    if len(search) >= 3 and db.get_bind().dialect.name == "sqlite":
+        if not _student_search_fts:
+            _student_search_fts = db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'StudentSearch'")
+            ).first() is not None
+        if _student_search_fts:
+            phrase = '"' + search.replace('"', '""') + '"'
+            matches = text(
+                "SELECT rowid FROM StudentSearch WHERE StudentSearch MATCH :phrase"
+            ).bindparams(phrase=phrase).columns(column("rowid"))
+            return models.Student.student_id.in_(matches)
+    
+    search_term = f"%{search}%"
+    return (
+        models.Student.full_name.ilike(search_term) |
+        models.Student.student_number.ilike(search_term) |
+        models.Student.email.ilike(search_term)
+    )
+
+def _student_linked_to(db: Session, user_id: int) -> Optional[str]:
+    """student_number of the Student already linked to ``user_id`` (Student.user_id is unique)."""
+    return db.scalar(select(models.Student.student_number).where(models.Student.user_id == user_id))
+
+def _link_conflict(student_number: str, linked_number: str) -> str:
+    return f"User '{student_number}' is already linked to student {linked_number}"
+
+def _existing_student_response(db: Session, student_number: str) -> StudentResponse:
+    """Idempotent create: auto-link the existing student to a User with the same username, then return it."""
+    existing_student = db.query(models.Student).filter(
+        models.Student.student_number == student_number
+    ).first()
+    try:
+        if getattr(existing_student, "user_id", None) in (None, 0):
+            user = db.query(models.User).filter(models.User.username == existing_student.student_number).first()
+            if user:
+                existing_student.user_id = user.id
+                db.commit()
+                db.refresh(existing_student)
+    except Exception:
+        db.rollback()
+    return _to_response(existing_student)
 
 # ---- Routes ----------------------------------------------------------------
 
@@ -84,42 +179,20 @@ def _validate_status(status: str):
 def create_student(
     student_data: StudentCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_doctor_user),
 ):
-    _require_doctor(current_user)
-    
     # Validate input
     _validate_year_level(student_data.year_level)
     _validate_status(student_data.status)
     
-    # Check if student number already exists
-    existing_student = db.query(models.Student).filter(
-        models.Student.student_number == student_data.student_number
-    ).first()
-    
-    if existing_student:
-        # Idempotent behavior: if student exists, try to auto-link to a User with same username, then return existing
-        try:
-            if getattr(existing_student, "user_id", None) in (None, 0):
-                user = db.query(models.User).filter(models.User.username == existing_student.student_number).first()
-                if user:
-                    existing_student.user_id = user.id
-                    db.commit()
-                    db.refresh(existing_student)
-        except Exception:
-            db.rollback()
-        return StudentResponse(
-            student_id=existing_student.student_id,
-            student_number=existing_student.student_number,
-            full_name=existing_student.full_name,
-            email=existing_student.email,
-            phone=existing_student.phone,
-            year_level=existing_student.year_level,
-            status=existing_student.status,
-            graduation_year=existing_student.graduation_year,
-            notes=existing_student.notes,
-            created_at=existing_student.created_at
-        )
+    # Cheap existence probe; the full row is only loaded on the (rare) duplicate path
+    duplicate_q = select(
+        select(models.Student.student_id)
+        .where(models.Student.student_number == student_data.student_number)
+        .exists()
+    )
+    if db.execute(duplicate_q).scalar():
+        return _existing_student_response(db, student_data.student_number)
     
     # Create new student
     try:
@@ -131,6 +204,13 @@ def create_student(
                 linked_user_id = candidate_user.id
         except Exception:
             linked_user_id = None
+        if linked_user_id is not None:
+            linked_number = _student_linked_to(db, linked_user_id)
+            if linked_number is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=_link_conflict(student_data.student_number, linked_number),
+                )
 
         new_student = models.Student(
             student_number=student_data.student_number,
@@ -145,23 +225,29 @@ def create_student(
             user_id=linked_user_id
         )
         
-        db.add(new_student)
+        # SAVEPOINT so a concurrent insert of the same student number only undoes this INSERT
+        try:
+            with db.begin_nested():
+                db.add(new_student)
+        except IntegrityError:
+            if db.execute(duplicate_q).scalar():
+                return _existing_student_response(db, student_data.student_number)
+            # A concurrent create linked the same user first
+            linked_number = _student_linked_to(db, linked_user_id) if linked_user_id is not None else None
+            if linked_number is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=_link_conflict(student_data.student_number, linked_number),
+                )
+            raise
         db.commit()
         db.refresh(new_student)
         
-        return StudentResponse(
-            student_id=new_student.student_id,
-            student_number=new_student.student_number,
-            full_name=new_student.full_name,
-            email=new_student.email,
-            phone=new_student.phone,
-            year_level=new_student.year_level,
-            status=new_student.status,
-            graduation_year=new_student.graduation_year,
-            notes=new_student.notes,
-            created_at=new_student.created_at
-        )
+        return _to_response(new_student)
         
+    except HTTPException:
+        db.rollback()
+        raise
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(status_code=400, detail="Failed to create student. Please check your input.")
@@ -172,6 +258,7 @@ def create_student(
 @router.get(
     "/students",
     response_model=List[StudentResponse],
+    response_class=ORJSONResponse,
     summary="List all students (doctor only)"
 )
 def list_students(
@@ -181,47 +268,29 @@ def list_students(
     limit: int = 50,
     offset: int = 0,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_doctor_user),
 ):
-    _require_doctor(current_user)
-    
-    query = db.query(models.Student)
+    # Plain column select: rows skip ORM hydration and identity-map tracking
+    query = select(*_RESPONSE_COLUMNS)
     
     # Apply filters
     if year_level:
         _validate_year_level(year_level)
-        query = query.filter(models.Student.year_level == year_level)
+        query = query.where(models.Student.year_level == year_level)
     
     if status:
         _validate_status(status)
-        query = query.filter(models.Student.status == status)
+        query = query.where(models.Student.status == status)
     
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            models.Student.full_name.ilike(search_term) |
-            models.Student.student_number.ilike(search_term) |
-            models.Student.email.ilike(search_term)
-        )
+        query = query.where(_search_filter(db, search))
     
     # Apply pagination and ordering
-    students = query.order_by(models.Student.created_at.desc()).offset(offset).limit(limit).all()
+    rows = db.execute(
+        query.order_by(models.Student.created_at.desc()).offset(offset).limit(limit)
+    ).all()
     
-    return [
-        StudentResponse(
-            student_id=student.student_id,
-            student_number=student.student_number,
-            full_name=student.full_name,
-            email=student.email,
-            phone=student.phone,
-            year_level=student.year_level,
-            status=student.status,
-            graduation_year=student.graduation_year,
-            notes=student.notes,
-            created_at=student.created_at
-        )
-        for student in students
-    ]
+    return [_to_response(row) for row in rows]
 
 @router.get(
     "/students/{student_id}",
@@ -231,27 +300,14 @@ def list_students(
 def get_student(
     student_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_doctor_user),
 ):
-    _require_doctor(current_user)
-    
     student = db.query(models.Student).filter(models.Student.student_id == student_id).first()
     
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
-    return StudentResponse(
-        student_id=student.student_id,
-        student_number=student.student_number,
-        full_name=student.full_name,
-        email=student.email,
-        phone=student.phone,
-        year_level=student.year_level,
-        status=student.status,
-        graduation_year=student.graduation_year,
-        notes=student.notes,
-        created_at=student.created_at
-    )
+    return _to_response(student)
 
 @router.put(
     "/students/{student_id}",
@@ -262,44 +318,49 @@ def update_student(
     student_id: int,
     student_data: StudentUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_doctor_user),
 ):
-    _require_doctor(current_user)
-    
-    student = db.query(models.Student).filter(models.Student.student_id == student_id).first()
+    # Update only provided fields
+    update_data = student_data.model_dump(exclude_unset=True)
     
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
+    for field in _REQUIRED_UPDATE_FIELDS:
+        if field in update_data and not (update_data[field] or "").strip():
+            raise HTTPException(status_code=400, detail=f"{field} cannot be empty")
+    if "year_level" in update_data:
+        _validate_year_level(update_data["year_level"])
+    if "status" in update_data:
+        _validate_status(update_data["status"])
     
-    # Update only provided fields
-    update_data = student_data.dict(exclude_unset=True)
+    if not update_data:
+        row = db.execute(
+            select(*_RESPONSE_COLUMNS).where(models.Student.student_id == student_id)
+        ).first()
+    else:
+        # Single UPDATE ... RETURNING round trip; the row is never loaded into the session
+        try:
+            row = db.execute(
+                update(models.Student)
+                .where(models.Student.student_id == student_id)
+                .values(**update_data)
+                .returning(*_RESPONSE_COLUMNS)
+            ).first()
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            # Only a clash with another student's number is reported as a duplicate
+            if "student_number" in update_data and db.scalar(
+                select(models.Student.student_id).where(
+                    models.Student.student_number == update_data["student_number"],
+                    models.Student.student_id != student_id,
+                )
+            ) is not None:
+                raise HTTPException(status_code=400, detail="Student number already exists")
+            raise HTTPException(status_code=400, detail="Failed to update student. Please check your input.")
     
-    for field, value in update_data.items():
-        if field == "year_level" and value:
-            _validate_year_level(value)
-        elif field == "status" and value:
-            _validate_status(value)
-        setattr(student, field, value)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Student not found")
     
-    try:
-        db.commit()
-        db.refresh(student)
-        
-        return StudentResponse(
-            student_id=student.student_id,
-            student_number=student.student_number,
-            full_name=student.full_name,
-            email=student.email,
-            phone=student.phone,
-            year_level=student.year_level,
-            status=student.status,
-            graduation_year=student.graduation_year,
-            notes=student.notes,
-            created_at=student.created_at
-        )
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Student number already exists")
+    return _to_response(row)
 
 @router.delete(
     "/students/{student_id}",
@@ -309,10 +370,8 @@ def update_student(
 def delete_student(
     student_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_doctor_user),
 ):
-    _require_doctor(current_user)
-    
     student = db.query(models.Student).filter(models.Student.student_id == student_id).first()
     
     if not student:
@@ -334,7 +393,7 @@ def delete_student(
 def bulk_import_students(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_doctor_user),
 ):
     """Bulk import students from a .txt file.
     
@@ -348,8 +407,6 @@ def bulk_import_students(
     DS2024001\tJohn Doe\tjohn.doe@dental.edu\t+1-555-0101\tFourth\tActive\t2024\tExcellent student
     DS2024002\tJane Smith\tjane.smith@dental.edu\t+1-555-0201\tFourth\tActive\t2024\tStrong academic performance
     """
-    _require_doctor(current_user)
-    
     # Validate file type
     if not file.filename or not file.filename.endswith('.txt'):
         raise HTTPException(status_code=400, detail="File must be a .txt file")
@@ -360,115 +417,128 @@ def bulk_import_students(
     total_processed = 0
     
     try:
-        # Read file content
+        # Read file content; tab and comma rows may be mixed in one file, so each
+        # line picks its own delimiter and the csv module tokenizes it (handles quoted fields)
         content = file.file.read().decode('utf-8')
-        lines = content.strip().split('\n')
-        
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line or line.startswith('#'):  # Skip empty lines and comments
-                continue
+        seen_numbers = set()  # pending rows are not flushed, so track in-file duplicates here
+        pending = []  # (line_num, student_number) added since the last commit
+
+        def commit_chunk():
+            # A failed chunk is rolled back as a whole: its rows are errors, not imports
+            nonlocal imported
+            try:
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                imported -= len(pending)
+                for failed_line, failed_number in pending:
+                    seen_numbers.discard(failed_number)
+                    errors.append(f"Line {failed_line}: not saved ({e.__class__.__name__})")
+            pending.clear()
+
+        with db.no_autoflush:
+            for line_num, line in enumerate(content.splitlines(), start=1):
+                if not line.strip() or line.lstrip().startswith('#'):  # Skip empty lines and comments
+                    continue
+                parts = next(csv.reader([line], delimiter='\t' if '\t' in line else ','))
                 
-            total_processed += 1
+                total_processed += 1
             
-            try:
-                # Try tab-separated first, then comma-separated
-                if '\t' in line:
-                    parts = line.split('\t')
-                elif ',' in line:
-                    parts = line.split(',')
-                else:
-                    # Single field - treat as student number only
-                    parts = [line]
+                try:
+                    # Parse fields based on your file format:
+                    # Column 0: Full Name
+                    # Column 1: Student ID  
+                    # Column 2: University Email
+                    # Column 3: Phone Number
+                    # Additional columns: year_level, status, graduation_year, notes
                 
-                # Clean up parts
-                parts = [part.strip() for part in parts]
+                    if len(parts) < 2:
+                        errors.append(f"Line {line_num}: Missing required fields (full name and student ID)")
+                        continue
                 
-                # Parse fields based on your file format:
-                # Column 0: Full Name
-                # Column 1: Student ID  
-                # Column 2: University Email
-                # Column 3: Phone Number
-                # Additional columns: year_level, status, graduation_year, notes
+                    full_name = _cell(parts, 0) or "Unknown Student"
+                    student_number = _cell(parts, 1)
+                    email = _cell(parts, 2)
+                    phone = _cell(parts, 3)
+                    year_level = _cell(parts, 4) or "Fourth"
+                    status = _cell(parts, 5) or "Active"
                 
-                if len(parts) < 2:
-                    errors.append(f"Line {line_num}: Missing required fields (full name and student ID)")
-                    continue
+                    if not student_number:
+                        errors.append(f"Line {line_num}: Missing student ID")
+                        continue
                 
-                full_name = parts[0] if parts[0] else f"Unknown Student"
-                student_number = parts[1] if len(parts) > 1 and parts[1] else None
-                email = parts[2] if len(parts) > 2 and parts[2] else None
-                phone = parts[3] if len(parts) > 3 and parts[3] else None
-                year_level = parts[4] if len(parts) > 4 and parts[4] else "Fourth"
-                status = parts[5] if len(parts) > 5 and parts[5] else "Active"
+                    # Parse graduation year
+                    graduation_year = None
+                    raw_year = _cell(parts, 6)
+                    if raw_year:
+                        try:
+                            graduation_year = int(raw_year)
+                        except ValueError:
+                            errors.append(f"Line {line_num}: Invalid graduation year '{raw_year}'")
+                            continue
                 
-                if not student_number:
-                    errors.append(f"Line {line_num}: Missing student ID")
-                    continue
+                    notes = _cell(parts, 7)
                 
-                # Parse graduation year
-                graduation_year = None
-                if len(parts) > 6 and parts[6]:
+                    # Validate year level and status
                     try:
-                        graduation_year = int(parts[6])
-                    except ValueError:
-                        errors.append(f"Line {line_num}: Invalid graduation year '{parts[6]}'")
+                        _validate_year_level(year_level)
+                        _validate_status(status)
+                    except HTTPException as e:
+                        errors.append(f"Line {line_num}: {e.detail}")
                         continue
                 
-                notes = parts[7] if len(parts) > 7 and parts[7] else None
-                
-                # Validate year level and status
-                try:
-                    _validate_year_level(year_level)
-                    _validate_status(status)
-                except HTTPException as e:
-                    errors.append(f"Line {line_num}: {e.detail}")
-                    continue
-                
-                # Check if student already exists
-                existing_student = db.query(models.Student).filter(
-                    models.Student.student_number == student_number
-                ).first()
+                    # Check if student already exists (earlier in this file, or in the DB)
+                    if student_number in seen_numbers or db.query(models.Student).filter(
+                        models.Student.student_number == student_number
+                    ).first():
+                        skipped += 1
+                        continue
                 
-                if existing_student:
-                    skipped += 1
-                    continue
+                    # Try to link to existing user
+                    linked_user_id = None
+                    try:
+                        candidate_user = db.query(models.User).filter(
+                            models.User.username == student_number
+                        ).first()
+                        if candidate_user:
+                            linked_user_id = candidate_user.id
+                    except Exception:
+                        pass
+                    if linked_user_id is not None:
+                        linked_number = _student_linked_to(db, linked_user_id)
+                        if linked_number is not None:
+                            errors.append(f"Line {line_num}: {_link_conflict(student_number, linked_number)}")
+                            continue
                 
-                # Try to link to existing user
-                linked_user_id = None
-                try:
-                    candidate_user = db.query(models.User).filter(
-                        models.User.username == student_number
-                    ).first()
-                    if candidate_user:
-                        linked_user_id = candidate_user.id
-                except Exception:
-                    pass
+                    # Create new student
+                    new_student = models.Student(
+                        student_number=student_number,
+                        full_name=full_name,
+                        email=email,
+                        phone=phone,
+                        year_level=year_level,
+                        status=status,
+                        graduation_year=graduation_year,
+                        notes=notes,
+                        created_at=datetime.utcnow(),
+                        user_id=linked_user_id
+                    )
                 
-                # Create new student
-                new_student = models.Student(
-                    student_number=student_number,
-                    full_name=full_name,
-                    email=email,
-                    phone=phone,
-                    year_level=year_level,
-                    status=status,
-                    graduation_year=graduation_year,
-                    notes=notes,
-                    created_at=datetime.utcnow(),
-                    user_id=linked_user_id
-                )
+                    db.add(new_student)
+                    seen_numbers.add(student_number)
+                    imported += 1
+                    pending.append((line_num, student_number))
                 
-                db.add(new_student)
-                imported += 1
+                except Exception as e:
+                    errors.append(f"Line {line_num}: {str(e)}")
+                    continue
                 
-            except Exception as e:
-                errors.append(f"Line {line_num}: {str(e)}")
-                continue
+                if len(pending) >= _IMPORT_CHUNK_SIZE:
+                    commit_chunk()
         
-        # Commit all changes
-        if imported > 0:
-            db.commit()
+        # Commit the remaining partial chunk
+        if pending:
+            commit_chunk()
         
         return BulkImportResponse(
             imported=imported,
@@ -5,8 +5,10 @@ from typing import Optional, List
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy.exc import IntegrityError
 
 from app.db import get_db
@@ -31,29 +33,34 @@ class StudentProfileUpdate(BaseModel):
     emergency_contact_relationship: Optional[str] = Field(None, description="Emergency contact relationship")
     emergency_contact_phone: Optional[str] = Field(None, description="Emergency contact phone")
 
+# Response models are frozen: module-level instances (the mock courses) are shared between requests
 class StudentProfileResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     student_id: int
     student_number: str
     full_name: str
-    email: Optional[str]
-    phone: Optional[str]
+    email: Optional[str] = None
+    phone: Optional[str] = None
     year_level: str
     status: str
-    graduation_year: Optional[int]
-    notes: Optional[str]
+    graduation_year: Optional[int] = None
+    notes: Optional[str] = None
     created_at: datetime
-    user_id: Optional[int]
+    user_id: Optional[int] = None
     
     # Enhanced profile fields
-    gpa: Optional[float]
-    date_of_birth: Optional[datetime]
-    nationality: Optional[str]
-    address: Optional[str]
-    emergency_contact_name: Optional[str]
-    emergency_contact_relationship: Optional[str]
-    emergency_contact_phone: Optional[str]
+    gpa: Optional[float] = None
+    date_of_birth: Optional[datetime] = None
+    nationality: Optional[str] = None
+    address: Optional[str] = None
+    emergency_contact_name: Optional[str] = None
+    emergency_contact_relationship: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
 
 class StudentCourseEnrollment(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     course_id: int
     course_title: str
     course_code: str
@@ -62,7 +69,9 @@ class StudentCourseEnrollment(BaseModel):
     enrolled_at: datetime
 
 class StudentAcademicInfo(BaseModel):
-    overall_gpa: Optional[float]
+    model_config = ConfigDict(frozen=True)
+
+    overall_gpa: Optional[float] = None
     credits_completed: int
     credits_required: int
     current_courses: List[StudentCourseEnrollment]
@@ -72,162 +81,213 @@ class GPAUpdate(BaseModel):
 
 # ---- Helpers ----------------------------------------------------------------
 
+# Mock course list for fourth-year students, built once at import
+_MOCK_ENROLLED_AT = datetime.utcnow()
+_FOURTH_YEAR_COURSES = [
+    StudentCourseEnrollment(
+        course_id=1,
+        course_title="Advanced Oral Surgery",
+        course_code="DENT401",
+        credits=4,
+        department_name="Oral Surgery",
+        enrolled_at=_MOCK_ENROLLED_AT
+    ),
+    StudentCourseEnrollment(
+        course_id=2,
+        course_title="Orthodontics Clinical Practice",
+        course_code="DENT402",
+        credits=3,
+        department_name="Orthodontics",
+        enrolled_at=_MOCK_ENROLLED_AT
+    ),
+    StudentCourseEnrollment(
+        course_id=3,
+        course_title="Periodontics",
+        course_code="DENT403",
+        credits=3,
+        department_name="Periodontics",
+        enrolled_at=_MOCK_ENROLLED_AT
+    ),
+]
+
+_DOCTOR_ROLES = frozenset({"doctor", "admin"})
+_STUDENT_ROLES = frozenset({"student", "doctor", "admin"})
+
 def _require_doctor(user: models.User):
-    if (user.role or "").lower() not in {"doctor", "admin"}:
+    if (user.role or "").lower() not in _DOCTOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Doctor or admin role required")
 
 def _require_student_or_doctor(user: models.User):
-    if (user.role or "").lower() not in {"student", "doctor", "admin"}:
+    if (user.role or "").lower() not in _STUDENT_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Student, doctor, or admin role required")
 
-# ---- Routes ----------------------------------------------------------------
+def _resolve_student_id_for_user(db: Session, user_id: int) -> Optional[int]:
+    # Read on every call: student_management can delete or relink the student at any time.
+    # The unique index on Student.user_id makes this a single index probe
+    return db.scalar(
+        select(models.Student.student_id).where(models.Student.user_id == user_id)
+    )
 
-@router.get(
-    "/{student_id}",
-    response_model=StudentProfileResponse,
-    summary="Get complete student profile"
-)
-def get_student_profile(
-    student_id: str,  # Changed to str to handle "me"
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
-):
-    _require_student_or_doctor(current_user)
-    
-    # Handle "me" endpoint for students
-    if student_id == "me":
-        if current_user.role != "student":
-            raise HTTPException(status_code=403, detail="Only students can use 'me' endpoint")
-        student = db.query(models.Student).filter(
-            models.Student.user_id == current_user.id
+# Profile routes only hydrate/return the columns StudentProfileResponse exposes
+_PROFILE_FIELDS = tuple(getattr(models.Student, name) for name in StudentProfileResponse.model_fields)
+_PROFILE_COLUMNS = load_only(*_PROFILE_FIELDS)
+
+def _get_student_for(db: Session, current_user: models.User, student_id: int, *columns):
+    """Primary-key fetch plus ownership check: students may only access their own record.
+
+    With ``columns`` a plain row of (student_id, user_id, *columns) is returned instead of
+    a Student entity.
+    """
+    if columns:
+        student = db.execute(
+            select(models.Student.student_id, models.Student.user_id, *columns)
+            .where(models.Student.student_id == student_id)
         ).first()
-        if not student:
-            raise HTTPException(status_code=404, detail="Student profile not found")
     else:
-        # If user is a student, they can only view their own profile
-        if current_user.role == "student":
-            student = db.query(models.Student).filter(
-                models.Student.user_id == current_user.id
-            ).first()
-            if not student or student.student_id != int(student_id):
-                raise HTTPException(status_code=403, detail="Access denied")
-        else:
-            # Doctor/admin can view any student profile
-            student = db.query(models.Student).filter(models.Student.student_id == int(student_id)).first()
-            if not student:
-                raise HTTPException(status_code=404, detail="Student not found")
-    
-    return StudentProfileResponse(
-        student_id=student.student_id,
-        student_number=student.student_number,
-        full_name=student.full_name,
-        email=student.email,
-        phone=student.phone,
-        year_level=student.year_level,
-        status=student.status,
-        graduation_year=student.graduation_year,
-        notes=student.notes,
-        created_at=student.created_at,
-        user_id=student.user_id,
-        gpa=getattr(student, 'gpa', None),
-        date_of_birth=getattr(student, 'date_of_birth', None),
-        nationality=getattr(student, 'nationality', None),
-        address=getattr(student, 'address', None),
-        emergency_contact_name=getattr(student, 'emergency_contact_name', None),
-        emergency_contact_relationship=getattr(student, 'emergency_contact_relationship', None),
-        emergency_contact_phone=getattr(student, 'emergency_contact_phone', None),
-    )
+        student = db.get(models.Student, student_id, options=[_PROFILE_COLUMNS])
+    if current_user.role == "student":
+        if not student or student.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Access denied")
+    elif not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+    return student
 
+# StudentProfileUpdate fields that map onto Student columns, resolved once at import
+_STUDENT_EDITABLE_COLS = frozenset(StudentProfileUpdate.model_fields) & frozenset(
+    column.name for column in models.Student.__table__.columns
+)
 
+_PROFILE_FIELD_NAMES = tuple(StudentProfileResponse.model_fields)
 
-@router.put(
-    "/{student_id}",
-    response_model=StudentProfileResponse,
-    summary="Update student profile (doctor can update GPA, student can update personal info)"
-)
-def update_student_profile(
-    student_id: str,  # Changed to str to handle "me"
+def _profile_payload(student) -> dict:
+    """Plain-dict profile for the write routes, which return ORJSONResponse directly."""
+    return {name: getattr(student, name) for name in _PROFILE_FIELD_NAMES}
+
+def _to_profile_response(student: models.Student) -> StudentProfileResponse:
+    return StudentProfileResponse.model_validate(student)
+
+def _target_student_id(db: Session, current_user: models.User, student_id: Optional[int]) -> int:
+    """The explicit id, or the caller's own student_id for the "me" routes (student_id=None)."""
+    if student_id is not None:
+        return student_id
+    if current_user.role != "student":
+        raise HTTPException(status_code=403, detail="Only students can use 'me' endpoint")
+    own_id = _resolve_student_id_for_user(db, current_user.id)
+    if own_id is None:
+        raise HTTPException(status_code=404, detail="Student profile not found")
+    return own_id
+
+def _read_profile(db: Session, current_user: models.User, student_id: Optional[int]) -> StudentProfileResponse:
+    _require_student_or_doctor(current_user)
+    target_id = _target_student_id(db, current_user, student_id)
+    return _to_profile_response(_get_student_for(db, current_user, target_id))
+
+def _update_profile(
+    db: Session,
+    current_user: models.User,
+    student_id: Optional[int],
     profile_data: StudentProfileUpdate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
-):
+) -> ORJSONResponse:
     _require_student_or_doctor(current_user)
     
-    # Handle "me" endpoint for students
-    if student_id == "me":
-        if current_user.role != "student":
-            raise HTTPException(status_code=403, detail="Only students can use 'me' endpoint")
-        student = db.query(models.Student).filter(
-            models.Student.user_id == current_user.id
-        ).first()
-        if not student:
-            raise HTTPException(status_code=404, detail="Student profile not found")
-    else:
-        # Get student
-        if current_user.role == "student":
-            student = db.query(models.Student).filter(
-                models.Student.user_id == current_user.id
-            ).first()
-            if not student or student.student_id != int(student_id):
-                raise HTTPException(status_code=403, detail="Access denied")
-        else:
-            student = db.query(models.Student).filter(models.Student.student_id == int(student_id)).first()
-            if not student:
-                raise HTTPException(status_code=404, detail="Student not found")
-    
-    # Update only provided fields
-    update_data = profile_data.dict(exclude_unset=True)
+    # Update only provided fields that map onto Student columns; settled before any DB work
+    update_data = {
+        field: value
+        for field, value in profile_data.model_dump(exclude_unset=True).items()
+        if field in _STUDENT_EDITABLE_COLS
+    }
 
     # Students can only update personal info, not GPA
     if current_user.role == "student" and "gpa" in update_data:
         raise HTTPException(status_code=403, detail="Students cannot update their own GPA")
 
+    student = _get_student_for(db, current_user, _target_student_id(db, current_user, student_id))
+    if not update_data:
+        return ORJSONResponse(_profile_payload(student))
+
     # Apply changes to Student model
     for field, value in update_data.items():
-        if hasattr(models.Student, field) and hasattr(student, field):
-            setattr(student, field, value)
+        setattr(student, field, value)
     
+    # Values identical to the stored ones leave the object clean - nothing to write
+    if not db.is_modified(student):
+        return ORJSONResponse(_profile_payload(student))
+    
+    # Every field in the response is already known in memory (none are server-computed);
+    # building it before commit avoids the refresh SELECT that expire_on_commit would force
+    payload = _profile_payload(student)
     try:
         db.commit()
-        db.refresh(student)
-        
-        # Also update the User table if full_name is being updated
-        if "full_name" in update_data and student.user_id:
-            user = db.query(models.User).filter(models.User.id == student.user_id).first()
-            if user:
-                # Update the user's username to match the new full_name for consistency
-                # This ensures the /auth/me endpoint returns the updated name
-                pass  # We don't update username, just keep the full_name in Student table
-        
-        return StudentProfileResponse(
-            student_id=student.student_id,
-            student_number=student.student_number,
-            full_name=student.full_name,
-            email=student.email,
-            phone=student.phone,
-            year_level=student.year_level,
-            status=student.status,
-            graduation_year=student.graduation_year,
-            notes=student.notes,
-            created_at=student.created_at,
-            user_id=student.user_id,
-            gpa=getattr(student, 'gpa', None),
-            date_of_birth=getattr(student, 'date_of_birth', None),
-            nationality=getattr(student, 'nationality', None),
-            address=getattr(student, 'address', None),
-            emergency_contact_name=getattr(student, 'emergency_contact_name', None),
-            emergency_contact_relationship=getattr(student, 'emergency_contact_relationship', None),
-            emergency_contact_phone=getattr(student, 'emergency_contact_phone', None),
-        )
+        # full_name lives only on Student; User.username is deliberately left untouched
+        return ORJSONResponse(payload)
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="Failed to update profile")
 
+# ---- Routes ----------------------------------------------------------------
+
+@router.get(
+    "/me",
+    response_model=StudentProfileResponse,
+    response_class=ORJSONResponse,
+    summary="Get the current student's profile"
+)
+def get_my_profile(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    return _read_profile(db, current_user, None)
+
+@router.get(
+    "/{student_id:int}",
+    response_model=StudentProfileResponse,
+    response_class=ORJSONResponse,
+    summary="Get complete student profile"
+)
+def get_student_profile(
+    student_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    return _read_profile(db, current_user, student_id)
+
+
+
+@router.put(
+    "/me",
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": StudentProfileResponse}},
+    summary="Update the current student's personal info"
+)
+def update_my_profile(
+    profile_data: StudentProfileUpdate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    return _update_profile(db, current_user, None, profile_data)
+
+@router.put(
+    "/{student_id:int}",
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": StudentProfileResponse}},
+    summary="Update student profile (doctor can update GPA, student can update personal info)"
+)
+def update_student_profile(
+    student_id: int,
+    profile_data: StudentProfileUpdate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    return _update_profile(db, current_user, student_id, profile_data)
+
 
 
 @router.get(
     "/{student_id}/academic-info",
     response_model=StudentAcademicInfo,
+    response_class=ORJSONResponse,
     summary="Get student academic information including courses and GPA"
 )
 def get_student_academic_info(
@@ -237,20 +297,10 @@ def get_student_academic_info(
 ):
     _require_student_or_doctor(current_user)
     
-    # Get student
-    if current_user.role == "student":
-        student = db.query(models.Student).filter(
-            models.Student.user_id == current_user.id
-        ).first()
-        if not student or student.student_id != student_id:
-            raise HTTPException(status_code=403, detail="Access denied")
-    else:
-        student = db.query(models.Student).filter(models.Student.student_id == student_id).first()
-        if not student:
-            raise HTTPException(status_code=404, detail="Student not found")
+    student = _get_student_for(db, current_user, student_id, models.Student.gpa, models.Student.year_level)
     
     # Get GPA from student record
-    overall_gpa = getattr(student, 'gpa', None)
+    overall_gpa = student.gpa
     
     # For now, return mock data for courses and credits
     # In a real implementation, you would have a CourseEnrollment table
@@ -260,32 +310,7 @@ def get_student_academic_info(
     
     # Mock some courses for demonstration
     if student.year_level == "Fourth":
-        current_courses = [
-            StudentCourseEnrollment(
-                course_id=1,
-                course_title="Advanced Oral Surgery",
-                course_code="DENT401",
-                credits=4,
-                department_name="Oral Surgery",
-                enrolled_at=datetime.utcnow()
-            ),
-            StudentCourseEnrollment(
-                course_id=2,
-                course_title="Orthodontics Clinical Practice",
-                course_code="DENT402",
-                credits=3,
-                department_name="Orthodontics",
-                enrolled_at=datetime.utcnow()
-            ),
-            StudentCourseEnrollment(
-                course_id=3,
-                course_title="Periodontics",
-                course_code="DENT403",
-                credits=3,
-                department_name="Periodontics",
-                enrolled_at=datetime.utcnow()
-            )
-        ]
+        current_courses = _FOURTH_YEAR_COURSES
         credits_completed = 90  # Mock completed credits
     
     return StudentAcademicInfo(
@@ -297,7 +322,9 @@ def get_student_academic_info(
 
 @router.post(
     "/{student_id}/update-gpa",
-    response_model=StudentProfileResponse,
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": StudentProfileResponse}},
     summary="Update student GPA (doctor only)"
 )
 def update_student_gpa(
@@ -308,41 +335,20 @@ def update_student_gpa(
 ):
     _require_doctor(current_user)
     
-    student = db.query(models.Student).filter(models.Student.student_id == student_id).first()
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
-    
-    # Update GPA
-    if hasattr(student, 'gpa'):
-        student.gpa = gpa_data.gpa
-    else:
-        # If the column doesn't exist yet, we'll handle it gracefully
-        pass
-    
+    # Single UPDATE ... RETURNING; the row is never loaded into the session
     try:
+        row = db.execute(
+            update(models.Student)
+            .where(models.Student.student_id == student_id)
+            .values(gpa=gpa_data.gpa)
+            .returning(*_PROFILE_FIELDS)
+        ).first()
         db.commit()
-        db.refresh(student)
-        
-        return StudentProfileResponse(
-            student_id=student.student_id,
-            student_number=student.student_number,
-            full_name=student.full_name,
-            email=student.email,
-            phone=student.phone,
-            year_level=student.year_level,
-            status=student.status,
-            graduation_year=student.graduation_year,
-            notes=student.notes,
-            created_at=student.created_at,
-            user_id=student.user_id,
-            gpa=getattr(student, 'gpa', None),
-            date_of_birth=getattr(student, 'date_of_birth', None),
-            nationality=getattr(student, 'nationality', None),
-            address=getattr(student, 'address', None),
-            emergency_contact_name=getattr(student, 'emergency_contact_name', None),
-            emergency_contact_relationship=getattr(student, 'emergency_contact_relationship', None),
-            emergency_contact_phone=getattr(student, 'emergency_contact_phone', None),
-        )
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to update GPA")
+    
+    if row is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+    
+    return ORJSONResponse(dict(row._mapping))
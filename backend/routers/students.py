@@ -1,7 +1,13 @@
 # routers/student.py
 from __future__ import annotations
 
+import base64
+import json
+import os
+import secrets
+import time
 from datetime import datetime
+from itertools import product
 from pathlib import Path
 from typing import List, Optional, Tuple
 
@@ -9,14 +15,17 @@ from fastapi import (
     APIRouter,
     Depends,
     HTTPException,
-    UploadFile,
-    File,
     Form,
     Query,
+    Request,
+    Response,
     status,
 )
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import DateTime, literal, select, text, update
+from sqlalchemy.orm import Session, load_only, raiseload
 from sqlalchemy.exc import IntegrityError
 
 from core.config import settings
@@ -24,15 +33,17 @@ from app.db import get_db
 from app import models
 from app.deps import get_current_active_user
 from app.schemas import SubmissionRead
+from utils.ttl_cache import assignment_window_cache, submission_list_cache
 
-router = APIRouter(prefix="/student", tags=["student"])
+router = APIRouter(prefix="/student", tags=["student"], default_response_class=ORJSONResponse)
 
 # ------------------------------ Files & Limits --------------------------------
 
 UPLOAD_DIR = Path(getattr(settings, "UPLOAD_DIR", "uploads"))
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-CHUNK_SIZE = 1024 * 1024  # 1MB
+WRITE_BUFFER_SIZE = 1024 * 1024  # uploads hit the disk in 1MB writes (held in memory per upload until then)
 MAX_UPLOAD_MB = int(getattr(settings, "MAX_UPLOAD_MB", 50))
+MAX_FIELD_BYTES = 64 * 1024  # non-file form fields (assignment_id, student_notes)
 
 IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tif", ".tiff"}
 PPT_EXTS = {".ppt", ".pptx"}
@@ -45,15 +56,61 @@ ALLOWED_EXTS = IMAGE_EXTS | PPT_EXTS | PDF_EXTS | OTHER_ALLOWED_EXTS
 
 VALID_STATUSES = {"Pending", "Accepted", "Rejected", "NeedsRevision"}
 
-# ------------------------------ Helpers ---------------------------------------
+# Columns the PATCH handlers check and echo back through _to_read()
+_SUBMISSION_READ_COLUMNS = (
+    models.Submission.submission_id, models.Submission.assignment_id,
+    models.Submission.student_id, models.Submission.status,
+    models.Submission.file_path, models.Submission.original_filename,
+    models.Submission.file_type, models.Submission.submitted_at,
+    models.Submission.student_notes,
+)
+_SUBMISSION_EDIT_LOAD = (load_only(*_SUBMISSION_READ_COLUMNS), raiseload("*"))
+
+# Ownership + editable-status guard used directly in UPDATE/DELETE statements;
+# :alt_status is 'NeedsRevision' when that status may be edited, else 'Pending'
+_EDIT_GUARD_SQL = "submission_id = :sid AND student_id = :uid AND status IN ('Pending', :alt_status)"
+
+# One query returns fully shaped SubmissionRead rows (same keys and title/course
+# fallbacks as _to_read), so the read routes hand them straight to orjson.
+# SubmissionFeedback.submission_id is UNIQUE, so the feedback LEFT JOIN never
+# multiplies rows and LIMIT/OFFSET page over submissions.
+_SUBMISSION_READ_COLUMNS_SQL = """
+            s.submission_id AS id,
+            s.assignment_id AS assignmentId,
+            COALESCE(NULLIF(a.title, ''), 'Assignment ' || s.assignment_id) AS title,
+            COALESCE(NULLIF(d.name, ''), 'Dental Course') AS course,
+            s.submitted_at AS submittedAt,
+            s.status,
+            s.original_filename AS fileName,
+            s.file_path AS fileUrl,
+            s.file_type AS fileType,
+            s.student_notes AS notes,
+            sf.grade,
+            sf.feedback_text AS feedback,
+            sf.created_at AS gradedAt"""
+_SUBMISSION_READ_FROM_SQL = """
+        FROM Submission s
+        JOIN Assignment a ON a.assignment_id = s.assignment_id
+        LEFT JOIN Department d ON d.department_id = a.department_id
+        LEFT JOIN SubmissionFeedback sf ON sf.submission_id = s.submission_id"""
 
-def _has_attr(obj, name: str) -> bool:
-    return hasattr(obj, name)
+_SUBMISSION_ORDER_COLUMNS = {
+    "submitted_at": "s.submitted_at",
+    "status": "s.status",
+    "assignment_id": "s.assignment_id",
+}
+
+# ------------------------------ Helpers ---------------------------------------
 
 def _require_student(user: models.User):
-    if (user.role or "").lower() not in {"student"}:
+    if (user.role or "").lower() != "student":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Student role required")
 
+def _student_user(current_user: models.User = Depends(get_current_active_user)) -> models.User:
+    """Dependency form of _require_student shared by every route in this module."""
+    _require_student(current_user)
+    return current_user
+
 def _infer_file_type(filename: str) -> str:
     ext = Path(filename).suffix.lower()
     if ext in IMAGE_EXTS: return "Image"
@@ -66,38 +123,192 @@ def _safe_name(filename: str) -> str:
     return Path(filename or "upload").name
 
 def _unique_disk_name(safe_name: str) -> str:
-    from uuid import uuid4
-    return f"{uuid4().hex}_{safe_name}"
+    # ns timestamp first so names sort (and cluster in the directory index) by
+    # upload time; 64 random bits keep same-instant uploads unique
+    return f"{time.time_ns():016x}_{secrets.token_hex(8)}_{safe_name}"
 
 def _public_path_for(unique_name: str) -> str:
     # your static files routing should serve /uploads/*
     return f"/uploads/{unique_name}"
 
-def _save_stream_to_disk(file: UploadFile, dest: Path) -> Tuple[int, str]:
+class _StreamedUpload:
     """
-    Streams to disk, enforces MAX_UPLOAD_MB, returns (bytes_written, mime_type).
+    python-multipart callbacks that write the ``file`` part straight into
+    UPLOAD_DIR while the request body is still arriving (no spooled temp file).
+    Bytes go to a hidden ``.tmp_`` sibling of ``dest``; publish() renames it into
+    place once the DB row is committed. Plain form fields are collected into ``fields``.
     """
-    total = 0
-    mime = file.content_type or ""
-    with dest.open("wb") as out:
-        while True:
-            chunk = file.file.read(CHUNK_SIZE)
-            if not chunk:
-                break
-            total += len(chunk)
-            if total > MAX_UPLOAD_MB * 1024 * 1024:
-                # stop early, cleanup, then raise
-                out.close()
-                try:
-                    dest.unlink(missing_ok=True)
-                except Exception:
-                    pass
-                raise HTTPException(
-                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    detail=f"File exceeds {MAX_UPLOAD_MB} MB limit",
-                )
-            out.write(chunk)
-    return total, mime
+
+    def __init__(self):
+        self.fields: dict = {}
+        self.filename: Optional[str] = None
+        self.dest: Optional[Path] = None
+        self._tmp: Optional[Path] = None
+        self.total = 0
+        self._out = None
+        self._buf = bytearray()
+        self._in_file = False
+        self._file_done = False
+        self._name = ""
+        self._data = bytearray()
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+
+    def on_part_begin(self):
+        self._in_file = False
+        self._name = ""
+        self._data.clear()
+        self._disposition = b""
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        self._name = options.get(b"name", b"").decode("utf-8", "replace")
+        if b"filename" not in options:
+            return
+        if self._name != "file" or self.dest is not None:
+            raise HTTPException(status_code=400, detail="Exactly one 'file' part is allowed")
+        safe_name = _safe_name(options[b"filename"].decode("utf-8", "replace"))
+        ext = Path(safe_name).suffix.lower()
+        if ext and (ext not in ALLOWED_EXTS):
+            raise HTTPException(status_code=400, detail=f"File type '{ext}' is not allowed")
+        self.filename = safe_name
+        self.dest = UPLOAD_DIR / _unique_disk_name(safe_name)
+        self._tmp = UPLOAD_DIR / f".tmp_{self.dest.name}"
+        # Opened by the first write_pending(), in the threadpool
+        self._in_file = True
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if not self._in_file:
+            self._data += data[start:end]
+            if len(self._data) > MAX_FIELD_BYTES:
+                raise HTTPException(status_code=413, detail=f"Form field '{self._name}' is too large")
+            return
+        self.total += end - start
+        if self.total > MAX_UPLOAD_MB * 1024 * 1024:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds {MAX_UPLOAD_MB} MB limit",
+            )
+        # Coalesce the parser's small slices into a few large write() calls;
+        # the disk I/O itself happens in write_pending(), off the event loop
+        self._buf += data[start:end]
+
+    def on_part_end(self):
+        if self._in_file:
+            self._in_file = False
+            self._file_done = True
+        else:
+            self.fields[self._name] = self._data.decode("utf-8", "replace")
+
+    @property
+    def has_pending_write(self) -> bool:
+        return len(self._buf) >= WRITE_BUFFER_SIZE or (
+            self._file_done and (self._out is None or not self._out.closed)
+        )
+
+    def write_pending(self):
+        """Blocking: open the file if needed, flush buffered bytes, and close it once its part has ended."""
+        if self._out is None:
+            self._out = self._tmp.open("wb")
+        if self._file_done:
+            self._close_out()
+        else:
+            self._flush()
+
+    def _flush(self):
+        if self._buf:
+            self._out.write(self._buf)
+            self._buf.clear()
+
+    def _close_out(self):
+        if self._out is None or self._out.closed:
+            return
+        self._flush()
+        # Uploads are write-once and served later through /uploads: start writeback
+        # and let the kernel drop these pages instead of evicting hot DB pages
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(self._out.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+        self._out.close()
+
+    def publish(self):
+        """Atomically move the finished upload to ``dest`` (same directory, no copy)."""
+        os.replace(self._tmp, self.dest)
+
+    def discard(self):
+        """Close and delete the unpublished upload, if any."""
+        self._buf.clear()
+        self._close_out()
+        if self._tmp is not None:
+            try:
+                self._tmp.unlink(missing_ok=True)
+            except Exception:
+                pass
+
+async def _receive_upload(request: Request) -> _StreamedUpload:
+    """
+    Parses a multipart/form-data body from ``request.stream()``, writing the
+    file next to its final location and enforcing MAX_UPLOAD_MB as bytes arrive.
+    Callers must publish() after committing, or discard() on failure.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=400, detail="Expected multipart/form-data body")
+
+    upload = _StreamedUpload()
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin": upload.on_part_begin,
+        "on_part_data": upload.on_part_data,
+        "on_part_end": upload.on_part_end,
+        "on_header_field": upload.on_header_field,
+        "on_header_value": upload.on_header_value,
+        "on_header_end": upload.on_header_end,
+        "on_headers_finished": upload.on_headers_finished,
+    })
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if upload.has_pending_write:
+                await run_in_threadpool(upload.write_pending)
+        parser.finalize()
+        if upload.dest is not None and not upload._file_done:
+            raise HTTPException(status_code=400, detail="Incomplete multipart upload")
+    except Exception:
+        await run_in_threadpool(upload.discard)
+        raise
+    if upload.dest is None:
+        raise HTTPException(status_code=422, detail="file is required")
+    return upload
+
+# Documents the multipart body that the streaming upload routes parse by hand.
+def _upload_openapi(*extra_fields: str) -> dict:
+    properties = {"file": {"type": "string", "format": "binary"}}
+    properties.update({name: {"type": "string"} for name in extra_fields})
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"multipart/form-data": {"schema": {
+                "type": "object",
+                "properties": properties,
+                "required": ["file"],
+            }}},
+        }
+    }
 
 def _to_read(row: models.Submission) -> SubmissionRead:
     return SubmissionRead(
@@ -113,23 +324,6 @@ def _to_read(row: models.Submission) -> SubmissionRead:
         notes=row.student_notes,
     )
 
-def _to_read_from_dict(row_dict) -> SubmissionRead:
-    return SubmissionRead(
-        id=row_dict["submission_id"],
-        assignmentId=row_dict["assignment_id"],
-        title=row_dict.get("assignment_title") or f"Assignment {row_dict['assignment_id']}",
-        course=row_dict.get("course") or "Dental Course",
-        submittedAt=row_dict["submitted_at"],
-        status=row_dict["status"],
-        fileName=row_dict["original_filename"],
-        fileUrl=row_dict["file_path"],
-        fileType=row_dict["file_type"],
-        notes=row_dict.get("student_notes"),
-        grade=row_dict.get("grade"),
-        feedback=row_dict.get("feedback_text"),
-        gradedAt=row_dict.get("graded_at"),
-    )
-
 def _ensure_submission_ownership(sub: models.Submission, user_id: int):
     if sub.student_id != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your submission")
@@ -142,7 +336,49 @@ def _validate_submission_for_edit(sub: models.Submission, allow_when_needs_revis
         return
     raise HTTPException(status_code=400, detail=f"Cannot modify a submission in status '{sub.status}'")
 
-def _assignment_time_window_ok(assignment: models.Assignment) -> bool:
+def _edit_guard_params(submission_id: int, user_id: int, allow_when_needs_revision: bool) -> dict:
+    alt_status = "NeedsRevision" if allow_when_needs_revision else "Pending"
+    return {"sid": submission_id, "uid": user_id, "alt_status": alt_status}
+
+def _raise_edit_refused(db: Session, submission_id: int, user_id: int, allow_when_needs_revision: bool):
+    """
+    A guarded UPDATE/DELETE matched nothing: look the row up once to report
+    404 / 403 / 400 exactly as the pre-checks used to.
+    """
+    sub = db.execute(
+        text("SELECT student_id, status FROM Submission WHERE submission_id = :sid"),
+        {"sid": submission_id},
+    ).first()
+    if not sub:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    _ensure_submission_ownership(sub, user_id)
+    _validate_submission_for_edit(sub, allow_when_needs_revision=allow_when_needs_revision)
+    raise HTTPException(status_code=409, detail="Submission changed concurrently, please retry")
+
+# Assignment time-window columns, resolved once from the mapped table
+_ASSIGNMENT_COLS = set(models.Assignment.__table__.columns.keys())
+_START_COL = next((c for c in ("start_at", "start_date", "open_at", "available_from") if c in _ASSIGNMENT_COLS), None)
+_END_COL = next((c for c in ("due_at", "due_date", "deadline", "close_at", "available_until") if c in _ASSIGNMENT_COLS), None)
+
+def _load_assignment_window(db: Session, assignment_id: int) -> Optional[Tuple[Optional[datetime], Optional[datetime]]]:
+    """Returns (starts, ends) for the assignment, or None if it does not exist (see utils.ttl_cache)."""
+    window = assignment_window_cache.get(assignment_id)
+    if window is not None:
+        return window
+    cols = [
+        getattr(models.Assignment, c) if c else literal(None, DateTime)
+        for c in (_START_COL, _END_COL)
+    ]
+    row = db.execute(
+        select(*cols).where(models.Assignment.assignment_id == assignment_id)
+    ).first()
+    if row is None:
+        return None
+    window = (row[0], row[1])
+    assignment_window_cache.set(assignment_id, window)
+    return window
+
+def _assignment_time_window_ok(starts: Optional[datetime], ends: Optional[datetime]) -> bool:
     """
     If your Assignment model has time window columns, enforce them.
     Recognizes: start_at/start_date/open_at/available_from and
@@ -150,79 +386,88 @@ def _assignment_time_window_ok(assignment: models.Assignment) -> bool:
     If none exist, allow by default.
     """
     now = datetime.utcnow()
-    starts = None
-    ends = None
-
-    for col in ("start_at", "start_date", "open_at", "available_from"):
-        if _has_attr(assignment, col):
-            starts = getattr(assignment, col)
-            break
-    for col in ("due_at", "due_date", "deadline", "close_at", "available_until"):
-        if _has_attr(assignment, col):
-            ends = getattr(assignment, col)
-            break
-
     if starts and now < starts:
         return False
     if ends and now > ends:
         return False
     return True
 
+def _ensure_assignment_open(db: Session, assignment_id: int):
+    if assignment_id <= 0:
+        raise HTTPException(status_code=400, detail="assignment_id must be positive")
+
+    # Validate assignment exists (window columns only, cached briefly)
+    window = _load_assignment_window(db, assignment_id)
+    if window is None:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+
+    # Optional: enforce assignment time window if present in schema
+    if not _assignment_time_window_ok(*window):
+        raise HTTPException(status_code=400, detail="Submission window is closed or not yet open")
+
+def _insert_submission(
+    db: Session,
+    *,
+    assignment_id: int,
+    student_id: int,
+    safe_name: str,
+    public_path: str,
+    student_notes: Optional[str],
+) -> models.Submission:
+    """
+    Commits a new Pending submission. On failure the session is rolled back and
+    400/500 is raised; the caller is responsible for discarding the file.
+    """
+    row = models.Submission(
+        assignment_id=assignment_id,
+        student_id=student_id,
+        original_filename=safe_name,
+        file_path=public_path,
+        file_type=_infer_file_type(safe_name),
+        submitted_at=datetime.utcnow(),
+        status="Pending",
+        student_notes=(student_notes or None),
+    )
+    try:
+        db.add(row)
+        db.commit()
+    except IntegrityError:
+        # e.g. a unique constraint (student_id, assignment_id) exists
+        db.rollback()
+        raise HTTPException(status_code=400, detail="You have already submitted for this assignment")
+    except Exception:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to create submission")
+    submission_list_cache.clear()
+    return row
+
 def _remove_disk_file_if_local(public_path: str):
     """
     Remove the physical file only if it lives under configured UPLOAD_DIR.
     """
+    # expected format: /uploads/<name>; .name drops any directory part, so the
+    # candidate is always a direct child of UPLOAD_DIR (no resolve() needed)
+    name = Path(public_path or "").name
+    if not name or "\\" in name or name in (".", ".."):
+        return
     try:
-        # expected format: /uploads/<name>
-        name = Path(public_path).name
-        candidate = UPLOAD_DIR / name
-        if candidate.is_file() and candidate.resolve().is_relative_to(UPLOAD_DIR.resolve()):
-            candidate.unlink()
-    except Exception:
+        (UPLOAD_DIR / name).unlink()
+    except OSError:
         pass
 
 # ------------------------------ Routes ----------------------------------------
 
-@router.get(
-    "/assignments",
-    response_model=List[dict],
-    summary="List available assignments for students to submit to",
-)
-def list_available_assignments(
-    department_id: Optional[int] = Query(None, description="Filter by department"),
-    target_year: Optional[str] = Query(None, description="Filter by target year"),
-    search: Optional[str] = Query(None, description="Search in assignment title"),
-    limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
-):
-    """List assignments that students can submit to."""
-    _require_student(current_user)
-    
-    # Build query for active assignments
+def _available_assignments_sql(has_dept: bool, has_year: bool, has_search: bool):
+    # Active assignments, plus the current student's submission status for each
     where_conditions = ["a.is_active = 1", "a.deadline > datetime('now')"]
-    params = {"limit": limit, "offset": offset}
-    
-    # Add department filter
-    if department_id is not None:
+    if has_dept:
         where_conditions.append("a.department_id = :dept_id")
-        params["dept_id"] = department_id
-    
-    # Add target year filter
-    if target_year and target_year != "All":
+    if has_year:
         where_conditions.append("(a.target_year = :target_year OR a.target_year = 'All')")
-        params["target_year"] = target_year
-    
-    # Add search filter
-    if search and search.strip():
+    if has_search:
         where_conditions.append("a.title LIKE :search_term")
-        params["search_term"] = f"%{search.strip()}%"
-    
-    where_clause = " AND ".join(where_conditions)
-    
-    # Query to get assignments with submission status for current student
-    sql = f"""
+
+    return text(f"""
         SELECT 
             a.assignment_id,
             a.title,
@@ -245,36 +490,48 @@ def list_available_assignments(
         LEFT JOIN Department d ON d.department_id = a.department_id
         LEFT JOIN AssignmentType at ON at.type_id = a.type_id
         LEFT JOIN Submission s ON s.assignment_id = a.assignment_id AND s.student_id = :student_id
-        WHERE {where_clause}
+        WHERE {" AND ".join(where_conditions)}
         ORDER BY a.deadline ASC
         LIMIT :limit OFFSET :offset
-    """
-    params["student_id"] = current_user.id
-    
-    rows = db.execute(text(sql), params).mappings().all()
-    
-    # Convert to list of dictionaries
-    assignments = []
-    for row in rows:
-        assignment = {
-            "assignment_id": row.assignment_id,
-            "title": row.title,
-            "description": row.description,
-            "deadline": row.deadline.isoformat() if hasattr(row.deadline, 'isoformat') else str(row.deadline) if row.deadline else None,
-            "max_grade": row.max_grade,
-            "max_file_size_mb": row.max_file_size_mb,
-            "instructions": row.instructions,
-            "target_year": row.target_year,
-            "department_name": row.department_name,
-            "assignment_type": row.assignment_type,
-            "submission_status": row.submission_status,
-            "submission_id": row.submission_id,
-            "submission_status_detail": row.submission_status_detail,
-            "submitted_at": row.submitted_at.isoformat() if hasattr(row.submitted_at, 'isoformat') else str(row.submitted_at) if row.submitted_at else None
-        }
-        assignments.append(assignment)
-    
-    return assignments
+    """)
+
+# All 8 filter combinations, keyed by (has_dept, has_year, has_search), built once
+_ASSIGNMENT_SQL_VARIANTS = {
+    key: _available_assignments_sql(*key) for key in product((False, True), repeat=3)
+}
+
+@router.get(
+    "/assignments",
+    response_model=List[dict],
+    summary="List available assignments for students to submit to",
+)
+def list_available_assignments(
+    department_id: Optional[int] = Query(None, description="Filter by department"),
+    target_year: Optional[str] = Query(None, description="Filter by target year"),
+    search: Optional[str] = Query(None, description="Search in assignment title"),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(_student_user),
+):
+    """List assignments that students can submit to."""
+    has_dept = department_id is not None
+    has_year = bool(target_year and target_year != "All")
+    has_search = bool(search and search.strip())
+
+    params = {"student_id": current_user.id, "limit": limit, "offset": offset}
+    if has_dept:
+        params["dept_id"] = department_id
+    if has_year:
+        params["target_year"] = target_year
+    if has_search:
+        params["search_term"] = f"%{search.strip()}%"
+
+    stmt = _ASSIGNMENT_SQL_VARIANTS[(has_dept, has_year, has_search)]
+    rows = db.execute(stmt, params).mappings().all()
+
+    # Columns already carry the response keys; orjson serializes deadline/submitted_at as-is
+    return ORJSONResponse([dict(row) for row in rows])
 
 
 @router.get(
@@ -285,11 +542,9 @@ def list_student_announcements(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_student_user),
 ):
     """Return announcements targeted to students or all users."""
-    _require_student(current_user)
-
     q = (
         db.query(models.Announcement)
         .filter(models.Announcement.status == "sent")
@@ -326,84 +581,55 @@ def list_my_submissions(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_student_user),
 ):
-    _require_student(current_user)
-
-    q = (
-        db.query(models.Submission)
-        .join(models.Assignment, models.Assignment.assignment_id == models.Submission.assignment_id)
-        .outerjoin(models.Department, models.Department.department_id == models.Assignment.department_id)
-        .filter(models.Submission.student_id == current_user.id)
-    )
+    where_conditions = ["s.student_id = :student_id"]
+    params = {"student_id": current_user.id, "limit": limit, "offset": offset}
 
     if status_filter:
         if status_filter not in VALID_STATUSES:
             raise HTTPException(status_code=400, detail="Invalid status filter")
-        q = q.filter(models.Submission.status == status_filter)
+        where_conditions.append("s.status = :status_filter")
+        params["status_filter"] = status_filter
 
     if assignment_id is not None:
-        q = q.filter(models.Submission.assignment_id == assignment_id)
+        where_conditions.append("s.assignment_id = :assignment_id")
+        params["assignment_id"] = assignment_id
 
-    order_col = {
-        "submitted_at": getattr(models.Submission, "submitted_at"),
-        "status": getattr(models.Submission, "status"),
-        "assignment_id": getattr(models.Submission, "assignment_id"),
-    }[order_by]
-    q = q.order_by(order_col.asc() if order_dir == "asc" else order_col.desc())
+    # order_by/order_dir are regex-validated above; the whitelist keeps them out of raw SQL
+    order_clause = f"{_SUBMISSION_ORDER_COLUMNS[order_by]} {'ASC' if order_dir == 'asc' else 'DESC'}"
 
-    # Execute query with joins to get assignment, department, and feedback info
     rows = db.execute(
-        text("""
-        SELECT 
-            s.submission_id, s.assignment_id, s.student_id, s.original_filename, 
-            s.file_path, s.file_type, s.submitted_at, s.status, s.student_notes,
-            a.title AS assignment_title, d.name AS course,
-            sf.grade, sf.feedback_text, sf.created_at AS graded_at
-        FROM Submission s
-        JOIN Assignment a ON a.assignment_id = s.assignment_id
-        LEFT JOIN Department d ON d.department_id = a.department_id
-        LEFT JOIN SubmissionFeedback sf ON sf.submission_id = s.submission_id
-        WHERE s.student_id = :student_id
-        ORDER BY s.submitted_at DESC
+        text(f"""
+        SELECT {_SUBMISSION_READ_COLUMNS_SQL}, COUNT(*) OVER () AS totalCount
+        {_SUBMISSION_READ_FROM_SQL}
+        WHERE {" AND ".join(where_conditions)}
+        ORDER BY {order_clause}
         LIMIT :limit OFFSET :offset
-        """),
-        {
-            "student_id": current_user.id,
-            "limit": limit,
-            "offset": offset
-        }
+        """).columns(submittedAt=DateTime, gradedAt=DateTime),
+        params,
     ).mappings().all()
-    
-    return [_to_read_from_dict(r) for r in rows]
+
+    return ORJSONResponse([dict(r) for r in rows])
 
 
 @router.get(
-    "/submissions/{submission_id}",
+    "/submissions/{submission_id:int}",
     response_model=SubmissionRead,
     summary="Get one of my submissions by ID",
 )
 def get_submission(
     submission_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_student_user),
 ):
-    _require_student(current_user)
-
-    # Get submission with feedback data
+    # Get submission with feedback data, already shaped as SubmissionRead
     row = db.execute(
-        text("""
-        SELECT 
-            s.submission_id, s.assignment_id, s.student_id, s.original_filename, 
-            s.file_path, s.file_type, s.submitted_at, s.status, s.student_notes,
-            a.title AS assignment_title, d.name AS course,
-            sf.grade, sf.feedback_text, sf.created_at AS graded_at
-        FROM Submission s
-        JOIN Assignment a ON a.assignment_id = s.assignment_id
-        LEFT JOIN Department d ON d.department_id = a.department_id
-        LEFT JOIN SubmissionFeedback sf ON sf.submission_id = s.submission_id
+        text(f"""
+        SELECT {_SUBMISSION_READ_COLUMNS_SQL}
+        {_SUBMISSION_READ_FROM_SQL}
         WHERE s.submission_id = :submission_id AND s.student_id = :student_id
-        """),
+        """).columns(submittedAt=DateTime, gradedAt=DateTime),
         {
             "submission_id": submission_id,
             "student_id": current_user.id
@@ -413,75 +639,53 @@ def get_submission(
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
     
-    return _to_read_from_dict(row)
+    return ORJSONResponse(dict(row))
 
 
+def _save_new_submission(db: Session, user_id: int, upload: _StreamedUpload) -> SubmissionRead:
+    """
+    Blocking half of create_submission: check the assignment, commit the row and
+    publish the file. The file is discarded on any failure before it is published.
+    """
+    published = False
+    try:
+        try:
+            assignment_id = int(upload.fields.get("assignment_id", ""))
+        except ValueError:
+            raise HTTPException(status_code=422, detail="assignment_id must be an integer")
+        _ensure_assignment_open(db, assignment_id)
+        row = _insert_submission(
+            db,
+            assignment_id=assignment_id,
+            student_id=user_id,
+            safe_name=upload.filename,
+            public_path=_public_path_for(upload.dest.name),
+            student_notes=upload.fields.get("student_notes"),
+        )
+        upload.publish()
+        published = True
+    finally:
+        if not published:
+            upload.discard()
+    db.refresh(row)
+    return _to_read(row)
+
 @router.post(
     "/submissions",
     response_model=SubmissionRead,
     status_code=status.HTTP_201_CREATED,
     summary="Upload a new submission (file + optional notes)",
+    openapi_extra=_upload_openapi("assignment_id", "student_notes"),
 )
 async def create_submission(
-    assignment_id: int = Form(...),
-    file: UploadFile = File(...),
-    student_notes: Optional[str] = Form(None),
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_student_user),
 ):
-    _require_student(current_user)
-
-    if assignment_id <= 0:
-        raise HTTPException(status_code=400, detail="assignment_id must be positive")
-
-    # Validate assignment exists
-    assignment = db.query(models.Assignment).filter(models.Assignment.assignment_id == assignment_id).first()
-    if not assignment:
-        raise HTTPException(status_code=404, detail="Assignment not found")
-
-    # Optional: enforce assignment time window if present in schema
-    if not _assignment_time_window_ok(assignment):
-        raise HTTPException(status_code=400, detail="Submission window is closed or not yet open")
-
-    # Validate extension
-    safe_name = _safe_name(file.filename or "upload")
-    ext = Path(safe_name).suffix.lower()
-    if ext and (ext not in ALLOWED_EXTS):
-        raise HTTPException(status_code=400, detail=f"File type '{ext}' is not allowed")
-
-    # Save to disk (streaming)
-    unique_name = _unique_disk_name(safe_name)
-    dest = UPLOAD_DIR / unique_name
-    bytes_written, _mime = _save_stream_to_disk(file, dest)
-
-    file_type = _infer_file_type(safe_name)
-    public_path = _public_path_for(unique_name)
-
-    row = models.Submission(
-        assignment_id=assignment_id,
-        student_id=current_user.id,
-        original_filename=safe_name,
-        file_path=public_path,
-        file_type=file_type,
-        submitted_at=datetime.utcnow(),
-        status="Pending",
-        student_notes=(student_notes or None),
-    )
-
-    try:
-        db.add(row)
-        db.commit()
-        db.refresh(row)
-        return _to_read(row)
-    except IntegrityError:
-        # e.g. a unique constraint (student_id, assignment_id) exists
-        _remove_disk_file_if_local(public_path)
-        db.rollback()
-        raise HTTPException(status_code=400, detail="You have already submitted for this assignment")
-    except Exception:
-        _remove_disk_file_if_local(public_path)
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Failed to create submission")
+    # Stream the body straight into UPLOAD_DIR (validates extension + size); the
+    # DB and file work after that blocks, so it runs in the threadpool
+    upload = await _receive_upload(request)
+    return await run_in_threadpool(_save_new_submission, db, current_user.id, upload)
 
 
 @router.patch(
@@ -493,78 +697,93 @@ def update_submission_notes(
     submission_id: int,
     student_notes: Optional[str] = Form(None),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_student_user),
 ):
-    _require_student(current_user)
+    # Ownership and status are checked by the UPDATE itself: one round trip
+    guard = _edit_guard_params(submission_id, current_user.id, True)
+    try:
+        row = db.execute(
+            update(models.Submission)
+            .where(text(_EDIT_GUARD_SQL).bindparams(**guard))
+            .values(student_notes=(student_notes or None))
+            .returning(*_SUBMISSION_READ_COLUMNS)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is not None:
+            db.commit()
+            submission_list_cache.clear()
+    except Exception:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to update notes")
+
+    if row is None:
+        _raise_edit_refused(db, submission_id, current_user.id, True)
+    return _to_read(row)
+
 
-    sub = db.query(models.Submission).filter(models.Submission.submission_id == submission_id).first()
+def _load_submission_for_edit(db: Session, submission_id: int, user_id: int) -> models.Submission:
+    sub = db.query(models.Submission).options(*_SUBMISSION_EDIT_LOAD).filter(models.Submission.submission_id == submission_id).first()
     if not sub:
         raise HTTPException(status_code=404, detail="Submission not found")
 
-    _ensure_submission_ownership(sub, current_user.id)
+    _ensure_submission_ownership(sub, user_id)
     _validate_submission_for_edit(sub, allow_when_needs_revision=True)
+    return sub
 
-    sub.student_notes = (student_notes or None)
-    try:
-        db.commit()
-        db.refresh(sub)
-        return _to_read(sub)
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Failed to update notes")
+def _swap_submission_file(db: Session, sub: models.Submission, upload: _StreamedUpload) -> SubmissionRead:
+    """
+    Blocking half of replace_submission_file: point the row at the new file, then
+    publish it and remove the old one. The new file is discarded on any failure
+    before it is published.
+    """
+    safe_name = upload.filename
+    new_public = _public_path_for(upload.dest.name)
+    old_public = sub.file_path
 
+    published = False
+    try:
+        # Update row
+        sub.original_filename = safe_name
+        sub.file_path = new_public
+        sub.file_type = _infer_file_type(safe_name)
+        sub.submitted_at = datetime.utcnow()  # bump submission time on replacement
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise HTTPException(status_code=500, detail="Failed to replace submission file")
+
+        submission_list_cache.clear()
+        upload.publish()
+        published = True
+    finally:
+        if not published:
+            upload.discard()
+
+    # Remove old file after successful commit
+    if old_public and old_public != new_public:
+        _remove_disk_file_if_local(old_public)
+    db.refresh(sub)
+    return _to_read(sub)
 
 @router.patch(
     "/submissions/{submission_id}/file",
     response_model=SubmissionRead,
     summary="Replace file for my submission (Pending/NeedsRevision)",
+    openapi_extra=_upload_openapi(),
 )
 async def replace_submission_file(
     submission_id: int,
-    file: UploadFile = File(...),
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_student_user),
 ):
-    _require_student(current_user)
+    # Only the body streaming runs on the event loop; DB and file work go to the threadpool
+    sub = await run_in_threadpool(_load_submission_for_edit, db, submission_id, current_user.id)
 
-    sub = db.query(models.Submission).filter(models.Submission.submission_id == submission_id).first()
-    if not sub:
-        raise HTTPException(status_code=404, detail="Submission not found")
-
-    _ensure_submission_ownership(sub, current_user.id)
-    _validate_submission_for_edit(sub, allow_when_needs_revision=True)
-
-    # Validate extension
-    safe_name = _safe_name(file.filename or "upload")
-    ext = Path(safe_name).suffix.lower()
-    if ext and (ext not in ALLOWED_EXTS):
-        raise HTTPException(status_code=400, detail=f"File type '{ext}' is not allowed")
-
-    # Save new file
-    unique_name = _unique_disk_name(safe_name)
-    dest = UPLOAD_DIR / unique_name
-    bytes_written, _mime = _save_stream_to_disk(file, dest)
-
-    new_public = _public_path_for(unique_name)
-    old_public = sub.file_path
-
-    # Update row
-    sub.original_filename = safe_name
-    sub.file_path = new_public
-    sub.file_type = _infer_file_type(safe_name)
-    sub.submitted_at = datetime.utcnow()  # bump submission time on replacement
-    try:
-        db.commit()
-        db.refresh(sub)
-        # Remove old file after successful commit
-        if old_public and old_public != new_public:
-            _remove_disk_file_if_local(old_public)
-        return _to_read(sub)
-    except Exception:
-        # cleanup new file on failure
-        _remove_disk_file_if_local(new_public)
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Failed to replace submission file")
+    # Stream new file straight to UPLOAD_DIR (validates extension + size)
+    upload = await _receive_upload(request)
+    return await run_in_threadpool(_swap_submission_file, db, sub, upload)
 
 
 @router.delete(
@@ -576,27 +795,34 @@ def delete_submission(
     submission_id: int,
     allow_when_needs_revision: bool = Query(False, description="Allow delete if status is NeedsRevision"),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_student_user),
 ):
-    _require_student(current_user)
-
-    sub = db.query(models.Submission).filter(models.Submission.submission_id == submission_id).first()
-    if not sub:
-        raise HTTPException(status_code=404, detail="Submission not found")
-
-    _ensure_submission_ownership(sub, current_user.id)
-    _validate_submission_for_edit(sub, allow_when_needs_revision=allow_when_needs_revision)
-
-    old_public = sub.file_path
+    # Ownership and status are checked by the DELETEs themselves; RETURNING hands
+    # back the stored path so no SELECT is needed up front
+    guard = _edit_guard_params(submission_id, current_user.id, allow_when_needs_revision)
     try:
-        db.delete(sub)
-        db.commit()
-        _remove_disk_file_if_local(old_public)
-        return
+        # NeedsRevision submissions carry a feedback row; drop it with the submission
+        db.execute(
+            text(f"DELETE FROM SubmissionFeedback WHERE submission_id IN (SELECT submission_id FROM Submission WHERE {_EDIT_GUARD_SQL})"),
+            guard,
+        )
+        old_public = db.execute(
+            text(f"DELETE FROM Submission WHERE {_EDIT_GUARD_SQL} RETURNING file_path"),
+            guard,
+        ).scalar()
+        if old_public is None:
+            db.rollback()
+        else:
+            db.commit()
+            submission_list_cache.clear()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to delete submission")
 
+    if old_public is None:
+        _raise_edit_refused(db, submission_id, current_user.id, allow_when_needs_revision)
+    _remove_disk_file_if_local(old_public)
+
 
 @router.get(
     "/submissions/stats",
@@ -604,29 +830,300 @@ def delete_submission(
 )
 def my_submission_stats(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: models.User = Depends(_student_user),
 ):
-    _require_student(current_user)
-
-    total = (
-        db.query(models.Submission)
-        .filter(models.Submission.student_id == current_user.id)
-        .count()
-    )
+    rows = db.execute(
+        text("SELECT status, COUNT(*) AS c FROM Submission WHERE student_id = :sid GROUP BY status"),
+        {"sid": current_user.id},
+    ).all()
     counts = {s: 0 for s in VALID_STATUSES}
-    if total:
-        for s in VALID_STATUSES:
-            counts[s] = (
-                db.query(models.Submission)
-                .filter(
-                    models.Submission.student_id == current_user.id,
-                    models.Submission.status == s,
-                )
-                .count()
-            )
+    for status_val, c in rows:
+        if status_val in counts:
+            counts[status_val] = c
+    total = sum(c for _, c in rows)
 
     return {
         "total": total,
         "by_status": counts,
         "generated_at": datetime.utcnow().isoformat(),
     }
+
+
+# ------------------------------ Resumable uploads (tus 1.0.0) -----------------
+#
+# Minimal tus core + creation extension for new submissions: the client creates
+# an upload, then PATCHes it in chunks and can HEAD it after a dropped
+# connection to resume from the stored offset. Bytes live in UPLOAD_DIR/.tus_<id>
+# with metadata in .tus_<id>.json, so any worker can serve any chunk. Once the
+# last byte arrives the normal submission row is created and the file is
+# renamed into place. A PATCH holds .tus_<id>.lock while it appends.
+# Uploads nobody has appended to for TUS_UPLOAD_TTL_SECONDS are deleted by the
+# sweep in tus_create_upload, and each student may have TUS_MAX_OPEN_UPLOADS open.
+
+TUS_VERSION = "1.0.0"
+_TUS_HEADERS = {"Tus-Resumable": TUS_VERSION}
+TUS_LOCK_STALE_SECONDS = 3600  # a lock left behind by a crashed worker is ignored after this
+TUS_UPLOAD_TTL_SECONDS = 24 * 3600
+TUS_MAX_OPEN_UPLOADS = 5
+
+def _tus_paths(upload_id: str) -> Tuple[Path, Path]:
+    if not upload_id.isalnum():
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return UPLOAD_DIR / f".tus_{upload_id}", UPLOAD_DIR / f".tus_{upload_id}.json"
+
+def _tus_check_version(request: Request):
+    if request.headers.get("tus-resumable") != TUS_VERSION:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Tus-Resumable {TUS_VERSION} required",
+            headers={"Tus-Version": TUS_VERSION},
+        )
+
+def _tus_parse_metadata(header: str) -> dict:
+    # "key base64value,key2 base64value2"
+    meta = {}
+    for pair in filter(None, (p.strip() for p in header.split(","))):
+        key, _, value = pair.partition(" ")
+        try:
+            meta[key] = base64.b64decode(value).decode("utf-8") if value else ""
+        except (ValueError, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail=f"Invalid Upload-Metadata value for '{key}'")
+    return meta
+
+def _tus_load(upload_id: str, user_id: int) -> Tuple[Path, Path, dict]:
+    data_path, meta_path = _tus_paths(upload_id)
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if meta["student_id"] != user_id:
+        # don't reveal other students' uploads
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return data_path, meta_path, meta
+
+def _tus_delete(data_path: Path, meta_path: Path):
+    for path in (data_path, meta_path):
+        path.unlink(missing_ok=True)
+
+def _tus_sweep(user_id: int) -> int:
+    """
+    Delete abandoned uploads (no append for TUS_UPLOAD_TTL_SECONDS) and their lock
+    files; returns how many live uploads ``user_id`` still has open.
+    """
+    now = time.time()
+    open_uploads = 0
+    for meta_path in UPLOAD_DIR.glob(".tus_*.json"):
+        data_path = meta_path.with_suffix("")
+        try:
+            # The data file's mtime moves with every append; the metadata's never does
+            last_write = (data_path if data_path.exists() else meta_path).stat().st_mtime
+            if now - last_write >= TUS_UPLOAD_TTL_SECONDS:
+                _tus_delete(data_path, meta_path)
+                data_path.with_suffix(".lock").unlink(missing_ok=True)
+            elif json.loads(meta_path.read_text())["student_id"] == user_id:
+                open_uploads += 1
+        except (OSError, ValueError, KeyError):
+            pass  # finished or removed concurrently, or unreadable: not counted
+    return open_uploads
+
+def _tus_lock(upload_id: str) -> Path:
+    """
+    Create the upload's lock file with O_EXCL (atomic, and visible to every worker),
+    or raise 423 while another PATCH holds it. The caller unlinks the returned path.
+    """
+    lock_path = UPLOAD_DIR / f".tus_{upload_id}.lock"
+    for _ in range(2):
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return lock_path
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime < TUS_LOCK_STALE_SECONDS:
+                    break
+                lock_path.unlink()
+            except FileNotFoundError:
+                pass  # released in the meantime: try again
+    raise HTTPException(
+        status_code=status.HTTP_423_LOCKED,
+        detail="Another request is appending to this upload",
+        headers=_TUS_HEADERS,
+    )
+
+def _tus_finish(db: Session, user_id: int, data_path: Path, meta_path: Path, meta: dict) -> int:
+    """
+    Blocking: move the bytes of a completed upload into place, then create the
+    submission. The move comes first so a committed row never points at a missing file.
+    """
+    safe_name = meta["filename"]
+    unique_name = _unique_disk_name(safe_name)
+    try:
+        _ensure_assignment_open(db, meta["assignment_id"])
+    except HTTPException:
+        _tus_delete(data_path, meta_path)
+        raise
+    final_path = UPLOAD_DIR / unique_name
+    os.replace(data_path, final_path)
+    try:
+        row = _insert_submission(
+            db,
+            assignment_id=meta["assignment_id"],
+            student_id=user_id,
+            safe_name=safe_name,
+            public_path=_public_path_for(unique_name),
+            student_notes=meta.get("student_notes"),
+        )
+    except HTTPException:
+        _tus_delete(final_path, meta_path)
+        raise
+    meta_path.unlink(missing_ok=True)
+    return row.submission_id
+
+@router.options("/submissions/tus", include_in_schema=False)
+def tus_options():
+    return Response(status_code=status.HTTP_204_NO_CONTENT, headers={
+        **_TUS_HEADERS,
+        "Tus-Version": TUS_VERSION,
+        "Tus-Extension": "creation",
+        "Tus-Max-Size": str(MAX_UPLOAD_MB * 1024 * 1024),
+    })
+
+@router.post(
+    "/submissions/tus",
+    status_code=status.HTTP_201_CREATED,
+    summary="Start a resumable (tus) submission upload",
+)
+def tus_create_upload(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(_student_user),
+):
+    _tus_check_version(request)
+    try:
+        length = int(request.headers.get("upload-length", ""))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Upload-Length header is required")
+    if length < 0:
+        raise HTTPException(status_code=400, detail="Upload-Length must not be negative")
+    if length > MAX_UPLOAD_MB * 1024 * 1024:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds {MAX_UPLOAD_MB} MB limit",
+        )
+
+    meta = _tus_parse_metadata(request.headers.get("upload-metadata", ""))
+    safe_name = _safe_name(meta.get("filename") or "upload")
+    ext = Path(safe_name).suffix.lower()
+    if ext and (ext not in ALLOWED_EXTS):
+        raise HTTPException(status_code=400, detail=f"File type '{ext}' is not allowed")
+    try:
+        assignment_id = int(meta.get("assignment_id", ""))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="assignment_id metadata must be an integer")
+    _ensure_assignment_open(db, assignment_id)
+    if _tus_sweep(current_user.id) >= TUS_MAX_OPEN_UPLOADS:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"At most {TUS_MAX_OPEN_UPLOADS} resumable uploads may be open at once",
+            headers=_TUS_HEADERS,
+        )
+
+    upload_id = secrets.token_hex(16)
+    data_path, meta_path = _tus_paths(upload_id)
+    data_path.touch(exist_ok=False)
+    meta_path.write_text(json.dumps({
+        "student_id": current_user.id,
+        "assignment_id": assignment_id,
+        "filename": safe_name,
+        "student_notes": meta.get("student_notes"),
+        "length": length,
+    }))
+    return Response(status_code=status.HTTP_201_CREATED, headers={
+        **_TUS_HEADERS,
+        # Path only: the Host header and query string are client-controlled
+        "Location": f"{request.url.path.rstrip('/')}/{upload_id}",
+        "Upload-Offset": "0",
+    })
+
+@router.head("/submissions/tus/{upload_id}", summary="Current offset of a resumable upload")
+def tus_upload_offset(
+    upload_id: str,
+    request: Request,
+    current_user: models.User = Depends(_student_user),
+):
+    _tus_check_version(request)
+    data_path, _meta_path, meta = _tus_load(upload_id, current_user.id)
+    try:
+        offset = data_path.stat().st_size
+    except FileNotFoundError:
+        # Finished (moved into place) or expired by a concurrent request since _tus_load
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return Response(headers={
+        **_TUS_HEADERS,
+        "Upload-Offset": str(offset),
+        "Upload-Length": str(meta["length"]),
+        "Cache-Control": "no-store",
+    })
+
+async def _tus_append(
+    request: Request, db: Session, user_id: int, data_path: Path, meta_path: Path, meta: dict
+) -> Response:
+    """Body of tus_append_chunk, run while the upload's lock is held."""
+    offset = (await run_in_threadpool(data_path.stat)).st_size
+    if request.headers.get("upload-offset") != str(offset):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Upload-Offset must be {offset}")
+
+    length = meta["length"]
+    received = offset
+    buf = bytearray()
+    out = await run_in_threadpool(data_path.open, "ab")
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > length:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="Chunk runs past Upload-Length",
+                )
+            buf += chunk
+            if len(buf) >= WRITE_BUFFER_SIZE:
+                await run_in_threadpool(out.write, bytes(buf))
+                buf.clear()
+    finally:
+        # Keep whatever arrived intact (even on disconnect) so the client can resume
+        if buf:
+            await run_in_threadpool(out.write, bytes(buf))
+        await run_in_threadpool(out.close)
+
+    headers = {**_TUS_HEADERS, "Upload-Offset": str(received)}
+    if received < length:
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+
+    # Last chunk: create the submission and move the bytes into place, off the event loop
+    submission_id = await run_in_threadpool(_tus_finish, db, user_id, data_path, meta_path, meta)
+    headers["X-Submission-Id"] = str(submission_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+
+@router.patch(
+    "/submissions/tus/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Append a chunk to a resumable upload",
+)
+async def tus_append_chunk(
+    upload_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(_student_user),
+):
+    _tus_check_version(request)
+    if request.headers.get("content-type") != "application/offset+octet-stream":
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content-Type must be application/offset+octet-stream",
+        )
+    data_path, meta_path, meta = await run_in_threadpool(_tus_load, upload_id, current_user.id)
+    # One PATCH per upload at a time, or two appends could interleave their bytes
+    lock_path = await run_in_threadpool(_tus_lock, upload_id)
+    try:
+        return await _tus_append(request, db, current_user.id, data_path, meta_path, meta)
+    finally:
+        await run_in_threadpool(lock_path.unlink, missing_ok=True)
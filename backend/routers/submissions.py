@@ -1,20 +1,30 @@
 # routers/submissions.py
 from __future__ import annotations
 
-from datetime import datetime
+import base64
+import binascii
+import hashlib
+import json
+import os
+import stat as stat_mod
+from datetime import datetime, timezone
+from email.utils import formatdate
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field, confloat
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 
 from core.config import settings
 from app.db import get_db
 from app import models
 from app.deps import get_current_active_user
+from utils.ttl_cache import submission_list_cache
 
 router = APIRouter(prefix="/submissions", tags=["submissions"])
 
@@ -22,9 +32,33 @@ router = APIRouter(prefix="/submissions", tags=["submissions"])
 
 UPLOAD_DIR = Path(getattr(settings, "UPLOAD_DIR", "uploads"))
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+_UPLOAD_DIR_RESOLVED = UPLOAD_DIR.resolve()
 
 # Accepted status values used elsewhere across the app
-VALID_STATUSES = {"Pending", "Accepted", "Rejected", "NeedsRevision"}
+VALID_STATUSES = frozenset({"Pending", "Accepted", "Rejected", "NeedsRevision"})
+
+# list_submissions order_by -> ORDER BY clause per direction; submitted_at gets
+# submission_id as tie-breaker so the keyset cursor is a strict total order
+_ORDER_COLS = {
+    "submitted_at": "s.submitted_at",
+    "status": "s.status",
+    "assignmentId": "s.assignment_id",
+    "studentId": "s.student_id",
+}
+_ORDER_SQL = {
+    (key, order_dir): (
+        f" ORDER BY s.submitted_at {direction}, s.submission_id {direction} " if key == "submitted_at"
+        else f" ORDER BY {col} {direction} "
+    )
+    for key, col in _ORDER_COLS.items()
+    for order_dir, direction in (("asc", "ASC"), ("desc", "DESC"))
+}
+
+# Keyset seek key for submitted_at. SQLite stores it as text: rows written through the
+# ORM carry microseconds, rows left to the server default (CURRENT_TIMESTAMP) have none.
+# Padding the short form gives both, and the DateTime-bound cursor, one lossless format.
+# Other databases compare real timestamps
+_SEEK_TS = {"sqlite": "substr(s.submitted_at || '.000000', 1, 26)"}
 
 # ------------------------------ Schemas ---------------------------------------
 
@@ -61,55 +95,152 @@ class StatusUpdatePayload(BaseModel):
 
 # ------------------------------ Helpers ---------------------------------------
 
-def _has_attr(obj, name: str) -> bool:
-    return hasattr(obj, name)
+# Optional schema links, resolved once from the mapped tables (columns don't change at runtime)
+def _columns(model) -> frozenset:
+    return frozenset(model.__table__.columns.keys())
+
+_SUBMISSION_COLS = _columns(models.Submission)
+_DOCTOR_COL = next((c for c in ("doctor_id", "assigned_doctor_id", "reviewer_id") if c in _SUBMISSION_COLS), None)
+_ASSIGNMENT_DOCTOR_COL = next((c for c in ("doctor_id", "reviewer_id") if c in _columns(models.Assignment)), None)
+# Assignment.created_by -> Doctor.doctor_id, with Doctor.user_id the doctor's login
+_ASSIGNMENT_HAS_CREATOR = "created_by" in _columns(models.Assignment)
+_SUBMISSION_HAS_REVIEWED_AT = "reviewed_at" in _SUBMISSION_COLS
+_FEEDBACK_HAS_DOCTOR_ID = "doctor_id" in _columns(models.SubmissionFeedback)
+_MODELS_WITH_UPDATED_AT = frozenset(
+    m for m in (models.Submission, models.SubmissionFeedback) if "updated_at" in _columns(m)
+)
+
+# Doctor scoping for list queries, as a condition on the Submission row `s` so the
+# database does the filtering: a doctor column on Submission, else one on the
+# assignment, else the assignment's creator
+if _DOCTOR_COL:
+    _DOCTOR_FILTER = (f"s.{_DOCTOR_COL} = :docid", "docid")
+elif _ASSIGNMENT_DOCTOR_COL:
+    _DOCTOR_FILTER = (
+        "EXISTS (SELECT 1 FROM Assignment a2 WHERE a2.assignment_id = s.assignment_id"
+        f" AND a2.{_ASSIGNMENT_DOCTOR_COL} = :docid)",
+        "docid",
+    )
+elif _ASSIGNMENT_HAS_CREATOR:
+    _DOCTOR_FILTER = (
+        "EXISTS (SELECT 1 FROM Assignment a2 JOIN Doctor dr ON dr.doctor_id = a2.created_by"
+        " WHERE a2.assignment_id = s.assignment_id AND dr.user_id = :docid)",
+        "docid",
+    )
+else:
+    _DOCTOR_FILTER = ("", "")
+
+# Column holding the owning doctor for single-row checks, aliased owner_doctor_id;
+# the same linkage as _DOCTOR_FILTER (the assignment creator's Doctor.user_id last)
+_OWNER_DOCTOR_SQL = (
+    f"s.{_DOCTOR_COL}" if _DOCTOR_COL
+    else f"a.{_ASSIGNMENT_DOCTOR_COL}" if _ASSIGNMENT_DOCTOR_COL
+    else "dr.user_id" if _ASSIGNMENT_HAS_CREATOR
+    else "NULL"
+)
+_OWNER_DOCTOR_JOIN = (
+    "LEFT JOIN Doctor dr ON dr.doctor_id = a.created_by"
+    if _OWNER_DOCTOR_SQL == "dr.user_id" else ""
+)
+
+# Submission + assignment/course + feedback (SubmissionFeedback.submission_id is
+# UNIQUE) in one round trip, for the detail-shaped responses
+_DETAIL_SQL = text(f"""
+    SELECT
+        s.submission_id, s.assignment_id, s.student_id, s.original_filename, s.file_path, s.file_type,
+        s.submitted_at, s.status, s.student_notes,
+        a.title AS assignment_title, d.name AS course,
+        {_OWNER_DOCTOR_SQL} AS owner_doctor_id,
+        fb.feedback_id, fb.doctor_id AS fb_doctor_id, fb.feedback_text, fb.grade, fb.created_at AS fb_created_at
+    FROM Submission s
+    JOIN Assignment a ON a.assignment_id = s.assignment_id
+    LEFT JOIN Department d ON d.department_id = a.department_id
+    {_OWNER_DOCTOR_JOIN}
+    LEFT JOIN SubmissionFeedback fb ON fb.submission_id = s.submission_id
+    WHERE s.submission_id = :sid
+""").columns(submitted_at=DateTime, fb_created_at=DateTime)
+
+def _row_is_assigned_to_doctor(row, doctor_user_id: int) -> bool:
+    """_submission_is_assigned_to_doctor for a _DETAIL_SQL row."""
+    return _OWNER_DOCTOR_SQL == "NULL" or row["owner_doctor_id"] == doctor_user_id
+
+def _feedback_from_row(row) -> Optional[FeedbackRead]:
+    if row["feedback_id"] is None:
+        return None
+    return FeedbackRead.model_construct(
+        id=row["feedback_id"],
+        doctorId=row.get("fb_doctor_id"),
+        text=row.get("feedback_text"),
+        grade=row.get("grade"),
+        createdAt=row.get("fb_created_at"),
+    )
+
+
+_DOCTOR_ROLES = frozenset({"doctor", "admin"})
 
 def _require_admin_or_doctor(user: models.User):
-    role = (user.role or "").lower()
-    if role not in {"admin", "doctor"}:
+    if (user.role or "").lower() not in _DOCTOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin or doctor role required")
 
 def _is_doctor(user: models.User) -> bool:
     return (user.role or "").lower() == "doctor"
 
 def _now() -> datetime:
-    return datetime.utcnow()
+    # Naive UTC, like every other timestamp stored by the app (utcnow() is deprecated)
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
-def _touch_updated(entity) -> None:
-    if _has_attr(entity, "updated_at"):
-        setattr(entity, "updated_at", _now())
+def _touch_updated(entity, now: datetime) -> None:
+    if type(entity) in _MODELS_WITH_UPDATED_AT:
+        setattr(entity, "updated_at", now)
 
 def _submission_is_assigned_to_doctor(sub: models.Submission, doctor_user_id: int) -> bool:
     """
     Authorization helper: if your schema links submission/assignment to a doctor,
     enforce that the current doctor can only manage their own items.
     """
-    for col in ("doctor_id", "assigned_doctor_id", "reviewer_id"):
-        if _has_attr(sub, col):
-            return getattr(sub, col) == doctor_user_id
-    if _has_attr(sub, "assignment") and sub.assignment is not None:
-        for col in ("doctor_id", "reviewer_id"):
-            if _has_attr(sub.assignment, col):
-                return getattr(sub.assignment, col) == doctor_user_id
+    if _DOCTOR_COL:
+        return getattr(sub, _DOCTOR_COL) == doctor_user_id
+    if _ASSIGNMENT_DOCTOR_COL and sub.assignment is not None:
+        return getattr(sub.assignment, _ASSIGNMENT_DOCTOR_COL) == doctor_user_id
+    if _ASSIGNMENT_HAS_CREATOR:
+        # Same rule as the list filter: the doctor who created the assignment
+        assignment = sub.assignment
+        return (
+            assignment is not None
+            and assignment.doctor is not None
+            and assignment.doctor.user_id == doctor_user_id
+        )
     # No linkage found -> allow
     return True
 
 def _doctor_filter_sql() -> Tuple[str, str]:
     """
-    For list queries, produce a WHERE clause to restrict by the current doctor if schema supports it.
+    For list queries, produce a WHERE condition to restrict by the current doctor if schema supports it.
     Returns ("", "") if no filter is possible.
     """
-    if _has_attr(models.Submission, "doctor_id"):
-        return " AND s.doctor_id = :docid ", "docid"
-    if _has_attr(models.Submission, "assigned_doctor_id"):
-        return " AND s.assigned_doctor_id = :docid ", "docid"
-    if _has_attr(models.Submission, "reviewer_id"):
-        return " AND s.reviewer_id = :docid ", "docid"
-    if _has_attr(models.Assignment, "doctor_id"):
-        return " AND a.doctor_id = :docid ", "docid"
-    if _has_attr(models.Assignment, "reviewer_id"):
-        return " AND a.reviewer_id = :docid ", "docid"
-    return "", ""
+    return _DOCTOR_FILTER
+
+# Leading magic bytes -> content type for the types students can upload
+_MAGIC_MEDIA_TYPES = (
+    (b"%PDF", "application/pdf"),
+    (b"\x89PNG", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+)
+_EXT_MEDIA_TYPES = {".pdf": "application/pdf", ".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+
+def _sniff_media_type(header: bytes) -> Optional[str]:
+    for magic, media_type in _MAGIC_MEDIA_TYPES:
+        if header.startswith(magic):
+            return media_type
+    return None
+
+
+def _media_type_from_name(filename: Optional[str]) -> Optional[str]:
+    if not filename:
+        return None
+    return _EXT_MEDIA_TYPES.get(Path(filename).suffix.lower())
+
 
 def _disk_path_from_public(public_path: str) -> Path:
     """
@@ -126,6 +257,95 @@ def _disk_path_from_public(public_path: str) -> Path:
     
     return UPLOAD_DIR / name
 
+# list_submissions results for repeated dashboard queries, keyed by a blake2b
+# hash of every query parameter (plus the doctor id when results are scoped to
+# them). See utils.ttl_cache for who clears it and why it is off under several workers.
+_list_cache = submission_list_cache
+
+def _list_cache_key(query: dict) -> str:
+    raw = json.dumps(query, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+# Keyset pagination for list_submissions ordered by submitted_at: an opaque
+# base64url("<submitted_at iso>|<submission_id>") of the last row on the page
+def _encode_cursor(submitted_at: datetime, submission_id: int) -> str:
+    raw = f"{submitted_at.isoformat()}|{submission_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, sid = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(sid)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@lru_cache(maxsize=256)
+def _list_sql(include_feedback: bool, where: Tuple[str, ...], order_sql: str, seek: bool):
+    """
+    list_submissions statement for one combination of clauses. The clauses only
+    hold bind names (values go in params), so there are few distinct combinations
+    and each text() is built, and compiled by SQLAlchemy's cache, once.
+    """
+    # feedback join: SubmissionFeedback.submission_id is UNIQUE, so this is at most
+    # one row per submission, found by a probe of that unique index
+    fb_select = ", fb.grade AS grade, fb.feedback_text AS feedback_text, fb.doctor_id AS reviewer_id" if include_feedback else ""
+    fb_join = "LEFT JOIN SubmissionFeedback fb ON fb.submission_id = s.submission_id" if include_feedback else ""
+
+    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+    sql = text(f"""
+        SELECT
+            s.submission_id, s.assignment_id, s.student_id, s.original_filename, s.file_path, s.file_type,
+            s.submitted_at, s.status, s.student_notes,
+            a.title AS assignment_title, d.name AS course
+            {fb_select}
+        FROM Submission s
+        JOIN Assignment a ON a.assignment_id = s.assignment_id
+        LEFT JOIN Department d ON d.department_id = a.department_id
+        {fb_join}
+        {where_sql}
+        {order_sql}
+        LIMIT :limit OFFSET :offset
+    """).columns(submitted_at=DateTime)
+    if seek:
+        # bind through DateTime: on SQLite always YYYY-MM-DD HH:MM:SS.ffffff, the format _SEEK_TS pads to
+        sql = sql.bindparams(bindparam("cur_ts", type_=DateTime))
+    return sql
+
+# submissions_stats: one grouped scan, optionally scoped like the list
+_STATS_SQL = text("SELECT status, COUNT(*) AS c FROM Submission GROUP BY status")
+_STATS_MINE_SQL = (
+    text(f"SELECT s.status, COUNT(*) AS c FROM Submission s WHERE {_DOCTOR_FILTER[0]} GROUP BY s.status")
+    if _DOCTOR_FILTER[1] else None
+)
+
+def _set_next_cursor(response: Response, page: List[SubmissionListItem], order_by: str, limit: int) -> None:
+    # A full page ordered by submitted_at may have more rows after it
+    if order_by == "submitted_at" and len(page) == limit and page[-1].submittedAt is not None:
+        response.headers["X-Next-Cursor"] = _encode_cursor(page[-1].submittedAt, page[-1].id)
+
+# Whether the AssignmentSearch FTS5 trigram table (see create_indexes.py) exists. Only a hit
+# is kept: until then each search probes again, so running create_indexes.py needs no restart
+_assignment_search_fts = False
+
+def _title_search_sql(db: Session, term: str, params: dict) -> str:
+    """Substring match on a.title, served by the trigram index when available."""
+    global _assignment_search_fts
+    dialect = db.get_bind().dialect.name
+    # Trigrams need at least 3 characters; shorter terms use the plain LIKE scan
+    if len(term) >= 3 and dialect == "sqlite":
+        if not _assignment_search_fts:
+            _assignment_search_fts = db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'AssignmentSearch'")
+            ).first() is not None
+        if _assignment_search_fts:
+            params["term"] = '"' + term.replace('"', '""') + '"'
+            return "a.assignment_id IN (SELECT rowid FROM AssignmentSearch WHERE AssignmentSearch MATCH :term)"
+
+    params["term"] = f"%{term}%"
+    # SQLite has no ILIKE; its LIKE is already case-insensitive for ASCII
+    return "a.title LIKE :term" if dialect == "sqlite" else "a.title ILIKE :term"
+
 # ------------------------------ Routes ----------------------------------------
 
 @router.get(
@@ -134,6 +354,7 @@ def _disk_path_from_public(public_path: str) -> Path:
     summary="List submissions (admin/doctor).",
 )
 def list_submissions(
+    response: Response,
     status_filter: Optional[str] = Query(None, description="Pending | Accepted | Rejected | NeedsRevision"),
     student_id: Optional[int] = Query(None),
     assignment_id: Optional[int] = Query(None),
@@ -147,94 +368,108 @@ def list_submissions(
     order_dir: str = Query("desc", regex="^(asc|desc)$"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from the X-Next-Cursor header of the previous page (order_by=submitted_at; replaces offset)",
+    ),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     _require_admin_or_doctor(current_user)
     if status_filter and status_filter not in VALID_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status filter")
+    if cursor is not None and order_by != "submitted_at":
+        raise HTTPException(status_code=400, detail="cursor requires order_by=submitted_at")
+    seek = _decode_cursor(cursor) if cursor is not None else None
 
-    # apply doctor restriction if needed
     doctor_clause, doctor_param = _doctor_filter_sql()
-    doctor_bind = {doctor_param: current_user.id} if (_is_doctor(current_user) and mine_only and doctor_param) else {}
+    if _is_doctor(current_user) and mine_only and not doctor_param:
+        # Nothing links submissions to doctors: refuse rather than show everyone's
+        raise HTTPException(status_code=403, detail="mine_only is not supported by this schema; pass mine_only=false")
+    scoped_to_doctor = bool(_is_doctor(current_user) and mine_only)
+    cache_key = _list_cache_key({
+        "status": status_filter, "sid": student_id, "aid": assignment_id, "dept": department_id,
+        "search": search, "fb": include_feedback, "from": from_date, "to": to_date,
+        "order": (order_by, order_dir), "page": (limit, offset, cursor),
+        "doctor": current_user.id if scoped_to_doctor else None,
+    })
+    cached = _list_cache.get(cache_key)
+    if cached is not None:
+        _set_next_cursor(response, cached, order_by, limit)
+        return cached
+
+    # Only the filters actually given go into the WHERE clause, each as a plain
+    # column comparison (e.g. s.status = :status) the indexes can serve;
+    # "(:x IS NULL OR col = :x)" forms force a scan
+    where = []
+    params = {}
+    if status_filter:
+        where.append("s.status = :status")
+        params["status"] = status_filter
+    if student_id is not None:
+        where.append("s.student_id = :sid")
+        params["sid"] = student_id
+    if assignment_id is not None:
+        where.append("s.assignment_id = :aid")
+        params["aid"] = assignment_id
 
-    # feedback join
-    fb_select = ", fb.grade AS grade, fb.feedback_text AS feedback_text, fb.doctor_id AS reviewer_id" if include_feedback else ""
-    fb_join = "LEFT JOIN SubmissionFeedback fb ON fb.submission_id = s.submission_id" if include_feedback else ""
+    # department filter (via assignment)
+    if department_id is not None:
+        where.append("a.department_id = :dept_id")
+        params["dept_id"] = department_id
 
-    # date filters
-    date_from = " AND (:from_date IS NULL OR s.submitted_at >= :from_date) "
-    date_to   = " AND (:to_date   IS NULL OR s.submitted_at <= :to_date) "
+    # apply doctor restriction if needed
+    if scoped_to_doctor:
+        where.append(doctor_clause)
+        params[doctor_param] = current_user.id
 
-    # department filter (via assignment)
-    dept_filter = " AND (:dept_id IS NULL OR d.department_id = :dept_id) "
+    # date filters
+    if from_date is not None:
+        where.append("s.submitted_at >= :from_date")
+        params["from_date"] = from_date
+    if to_date is not None:
+        where.append("s.submitted_at <= :to_date")
+        params["to_date"] = to_date
 
     # search in title
-    where_search = ""
-    params = {
-        "status": status_filter,
-        "sid": student_id,
-        "aid": assignment_id,
-        "dept_id": department_id,
-        "from_date": from_date,
-        "to_date": to_date,
-        **doctor_bind,
-    }
     if search and search.strip():
-        where_search = " AND (a.title ILIKE :term) "
-        params["term"] = f"%{search.strip()}%"
+        where.append(_title_search_sql(db, search.strip(), params))
 
     # order
-    order_col = {
-        "submitted_at": "s.submitted_at",
-        "status": "s.status",
-        "assignmentId": "s.assignment_id",
-        "studentId": "s.student_id",
-    }[order_by]
-    order_sql = f" ORDER BY {order_col} {'ASC' if order_dir == 'asc' else 'DESC'} "
-
-    sql = f"""
-        SELECT
-            s.submission_id, s.assignment_id, s.student_id, s.original_filename, s.file_path, s.file_type,
-            s.submitted_at, s.status, s.student_notes,
-            a.title AS assignment_title, d.name AS course
-            {fb_select}
-        FROM Submission s
-        JOIN Assignment a ON a.assignment_id = s.assignment_id
-        LEFT JOIN Department d ON d.department_id = a.department_id
-        {fb_join}
-        WHERE (:status IS NULL OR s.status = :status)
-          AND (:sid IS NULL OR s.student_id = :sid)
-          AND (:aid IS NULL OR s.assignment_id = :aid)
-          {dept_filter}
-          {doctor_clause}
-          {date_from}
-          {date_to}
-          {where_search}
-        {order_sql}
-        LIMIT :limit OFFSET :offset
-    """
+    order_sql = _ORDER_SQL[(order_by, order_dir)]
+
+    # keyset: seek past the previous page's last row instead of OFFSET-skipping
+    if seek:
+        seek_ts = _SEEK_TS.get(db.get_bind().dialect.name, "s.submitted_at")
+        where.append(f"({seek_ts}, s.submission_id) {'>' if order_dir == 'asc' else '<'} (:cur_ts, :cur_id)")
+        params["cur_ts"], params["cur_id"] = seek
+
+    sql = _list_sql(include_feedback, tuple(where), order_sql, seek is not None)
     params["limit"] = limit
-    params["offset"] = offset
+    params["offset"] = 0 if seek else offset
 
     rows = db.execute(sql, params).mappings().all()
-    out: List[SubmissionListItem] = []
-    for r in rows:
-        out.append(SubmissionListItem(
+    # Rows come typed from the DB, so skip per-row validation (model_construct)
+    out: List[SubmissionListItem] = [
+        SubmissionListItem.model_construct(
             id=r["submission_id"],
             assignmentId=r["assignment_id"],
             studentId=r["student_id"],
-            title=r.get("assignment_title"),
-            course=r.get("course"),
-            submittedAt=r.get("submitted_at"),
+            title=r["assignment_title"],
+            course=r["course"],
+            submittedAt=r["submitted_at"],
             status=r["status"],
-            fileName=r.get("original_filename"),
-            filePath=r.get("file_path"),
-            fileType=r.get("file_type"),
-            notes=r.get("student_notes"),
-            grade=r.get("grade") if include_feedback else None,
-            reviewerId=r.get("reviewer_id") if include_feedback else None,
-        ))
+            fileName=r["original_filename"],
+            filePath=r["file_path"],
+            fileType=r["file_type"],
+            notes=r["student_notes"],
+            grade=r["grade"] if include_feedback else None,
+            reviewerId=r["reviewer_id"] if include_feedback else None,
+        )
+        for r in rows
+    ]
+    _list_cache.set(cache_key, out)
+    _set_next_cursor(response, out, order_by, limit)
     return out
 
 
@@ -250,35 +485,16 @@ def get_submission(
 ):
     _require_admin_or_doctor(current_user)
 
-    sub_row = db.execute(
-        """
-        SELECT s.*, a.title AS assignment_title, d.name AS course
-        FROM Submission s
-        JOIN Assignment a ON a.assignment_id = s.assignment_id
-        LEFT JOIN Department d ON d.department_id = a.department_id
-        WHERE s.submission_id = :sid
-        """,
-        {"sid": submission_id},
-    ).mappings().first()
+    # One query: row, ownership column and feedback
+    sub_row = db.execute(_DETAIL_SQL, {"sid": submission_id}).mappings().first()
 
     if not sub_row:
         raise HTTPException(status_code=404, detail="Submission not found")
 
-    # ORM object for fine-grained doctor ownership checks
-    sub_obj = db.query(models.Submission).filter(models.Submission.submission_id == submission_id).first()
-    if _is_doctor(current_user) and not _submission_is_assigned_to_doctor(sub_obj, current_user.id):
+    if _is_doctor(current_user) and not _row_is_assigned_to_doctor(sub_row, current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed to access this submission")
 
-    fb = db.execute(
-        """
-        SELECT feedback_id, doctor_id, feedback_text, grade, created_at
-        FROM SubmissionFeedback
-        WHERE submission_id = :sid
-        """,
-        {"sid": submission_id},
-    ).mappings().first()
-
-    submission = SubmissionListItem(
+    submission = SubmissionListItem.model_construct(
         id=sub_row["submission_id"],
         assignmentId=sub_row["assignment_id"],
         studentId=sub_row["student_id"],
@@ -290,19 +506,12 @@ def get_submission(
         submittedAt=sub_row.get("submitted_at"),
         status=sub_row["status"],
         notes=sub_row.get("student_notes"),
+        grade=None,
+        reviewerId=None,
     )
+    feedback = _feedback_from_row(sub_row)
 
-    feedback = None
-    if fb:
-        feedback = FeedbackRead(
-            id=fb["feedback_id"],
-            doctorId=fb.get("doctor_id"),
-            text=fb.get("feedback_text"),
-            grade=fb.get("grade"),
-            createdAt=fb.get("created_at"),
-        )
-
-    return SubmissionDetailResponse(submission=submission, feedback=feedback)
+    return SubmissionDetailResponse.model_construct(submission=submission, feedback=feedback)
 
 
 @router.get(
@@ -311,6 +520,7 @@ def get_submission(
     summary="Download submission file (admin/doctor).",
 )
 def download_submission_file(
+    request: Request,
     submission_id: int,
     inline: bool = Query(False, description="If true, set Content-Disposition inline when possible"),
     db: Session = Depends(get_db),
@@ -325,84 +535,52 @@ def download_submission_file(
     if _is_doctor(current_user) and not _submission_is_assigned_to_doctor(sub, current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed to access this submission")
 
-    # Simple approach: find the actual file
-    disk = None
-    
-    # First try the stored path
-    if sub.file_path:
-        disk = _disk_path_from_public(sub.file_path)
-        if disk.is_file():
-            # Check if it's the right content type
-            with open(disk, 'rb') as f:
-                header = f.read(4)
-                # If it's a txt file but contains PDF content, serve it as PDF
-                if header == b'%PDF' and sub.original_filename and sub.original_filename.lower().endswith('.pdf'):
-                    pass  # This is fine, we'll handle content-type below
-                elif disk.name.endswith('.txt') and sub.original_filename and not sub.original_filename.endswith('.txt'):
-                    # Wrong file type, try to find correct one
-                    disk = None
-    
-    # If no valid file found, search by original filename
-    if not disk or not disk.is_file():
-        uploads_dir = UPLOAD_DIR
-        if sub.original_filename:
-            # Try exact match first
-            for file_path in uploads_dir.glob(f"*{sub.original_filename}"):
-                if file_path.is_file():
-                    disk = file_path
-                    break
-            
-            # If still not found, try base name match
-            if not disk or not disk.is_file():
-                base_name = Path(sub.original_filename).stem
-                for file_path in uploads_dir.glob(f"*{base_name}*"):
-                    if file_path.is_file():
-                        with open(file_path, 'rb') as f:
-                            header = f.read(4)
-                            # Match content type with expected type
-                            if sub.original_filename.lower().endswith('.pdf') and header == b'%PDF':
-                                disk = file_path
-                                break
-                            elif sub.original_filename.lower().endswith(('.png', '.jpg', '.jpeg')) and (header.startswith(b'\x89PNG') or header.startswith(b'\xff\xd8\xff')):
-                                disk = file_path
-                                break
-    
-    if not disk or not disk.is_file():
+    # Uploads are stored under a unique name and file_path records it, so the
+    # stored path is the only place to look
+    disk = _disk_path_from_public(sub.file_path) if sub.file_path else None
+    try:
+        st = os.stat(disk) if disk else None
+    except OSError:
+        st = None
+    if st is None or not stat_mod.S_ISREG(st.st_mode):
         raise HTTPException(status_code=404, detail="File not found")
 
-    headers = {}
-    
-    # Force correct content type based on actual file content
+    # Conditional GET: a client that already has this version gets an empty 304
+    etag = f'W/"{st.st_size:x}-{st.st_mtime_ns:x}"'
+    validators = {
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=validators)
+
     with open(disk, 'rb') as f:
-        header = f.read(4)
-        if header == b'%PDF':
-            headers["Content-Type"] = "application/pdf"
-        elif header.startswith(b'\x89PNG'):
-            headers["Content-Type"] = "image/png"
-        elif header.startswith(b'\xff\xd8\xff'):
-            headers["Content-Type"] = "image/jpeg"
-        else:
-            # Fallback to original filename extension
-            if sub.original_filename:
-                if sub.original_filename.lower().endswith('.pdf'):
-                    headers["Content-Type"] = "application/pdf"
-                elif sub.original_filename.lower().endswith('.png'):
-                    headers["Content-Type"] = "image/png"
-                elif sub.original_filename.lower().endswith(('.jpg', '.jpeg')):
-                    headers["Content-Type"] = "image/jpeg"
-    
+        header = f.read(8)
+
+    # Force correct content type based on actual file content, falling back
+    # to the original filename extension
+    media_type = _sniff_media_type(header) or _media_type_from_name(sub.original_filename)
+
     # Always use original filename for download
     download_filename = sub.original_filename or disk.name
-    
+
+    headers = dict(validators)
     if inline:
         headers["Content-Disposition"] = f'inline; filename="{download_filename}"'
     else:
         headers["Content-Disposition"] = f'attachment; filename="{download_filename}"'
 
+    # Passing media_type lets FileResponse skip its own guess; it streams
+    # the file itself (sendfile where the server supports it)
     return FileResponse(
         path=str(disk),
         headers=headers,
+        media_type=media_type,
         filename=download_filename,
+        stat_result=st,
     )
 
 
@@ -428,24 +606,33 @@ def update_submission_status(
     if body.status == "NeedsRevision" and (body.feedback_text is None or not body.feedback_text.strip()):
         raise HTTPException(status_code=400, detail="Feedback text is required when marking NeedsRevision")
 
-    sub = db.query(models.Submission).filter(models.Submission.submission_id == submission_id).first()
+    # Submission, assignment/department (title + course) and feedback in one query
+    sub = (
+        db.query(models.Submission)
+        .options(
+            joinedload(models.Submission.assignment).joinedload(models.Assignment.department),
+            joinedload(models.Submission.feedback),
+        )
+        .filter(models.Submission.submission_id == submission_id)
+        .first()
+    )
     if not sub:
         raise HTTPException(status_code=404, detail="Submission not found")
 
     if _is_doctor(current_user) and not _submission_is_assigned_to_doctor(sub, current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed to modify this submission")
 
+    # One timestamp for every column this update touches
+    now = _now()
     try:
         # Update status (+ reviewed_at if exists)
         sub.status = body.status
-        if _has_attr(sub, "reviewed_at"):
-            sub.reviewed_at = _now()
-        _touch_updated(sub)
+        if _SUBMISSION_HAS_REVIEWED_AT:
+            sub.reviewed_at = now
+        _touch_updated(sub, now)
 
         # Upsert feedback if provided
-        fb = db.query(models.SubmissionFeedback).filter(
-            models.SubmissionFeedback.submission_id == submission_id
-        ).first()
+        fb = sub.feedback
 
         has_any_feedback = (body.feedback_text is not None) or (body.grade is not None)
 
@@ -456,69 +643,52 @@ def update_submission_status(
                 if body.grade is not None:
                     fb.grade = body.grade
                 # ensure doctor_id if missing
-                if _has_attr(fb, "doctor_id") and getattr(fb, "doctor_id", None) in (None, 0) and _is_doctor(current_user):
+                if _FEEDBACK_HAS_DOCTOR_ID and getattr(fb, "doctor_id", None) in (None, 0) and _is_doctor(current_user):
                     fb.doctor_id = current_user.id
-                _touch_updated(fb)
+                _touch_updated(fb, now)
             else:
                 kwargs = dict(
                     submission_id=submission_id,
                     feedback_text=body.feedback_text,
                     grade=body.grade,
                 )
-                if _has_attr(models.SubmissionFeedback, "doctor_id") and _is_doctor(current_user):
+                if _FEEDBACK_HAS_DOCTOR_ID and _is_doctor(current_user):
                     kwargs["doctor_id"] = current_user.id
                 fb = models.SubmissionFeedback(**kwargs)
                 db.add(fb)
 
-        db.commit()
-
-        # Re-fetch detail payload
-        sub_row = db.execute(
-            """
-            SELECT s.*, a.title AS assignment_title, d.name AS course
-            FROM Submission s
-            JOIN Assignment a ON a.assignment_id = s.assignment_id
-            LEFT JOIN Department d ON d.department_id = a.department_id
-            WHERE s.submission_id = :sid
-            """,
-            {"sid": submission_id},
-        ).mappings().first()
-
-        fb_row = db.execute(
-            """
-            SELECT feedback_id, doctor_id, feedback_text, grade, created_at
-            FROM SubmissionFeedback
-            WHERE submission_id = :sid
-            """,
-            {"sid": submission_id},
-        ).mappings().first()
-
-        submission = SubmissionListItem(
-            id=sub_row["submission_id"],
-            assignmentId=sub_row["assignment_id"],
-            studentId=sub_row["student_id"],
-            title=sub_row.get("assignment_title"),
-            course=sub_row.get("course"),
-            fileName=sub_row.get("original_filename"),
-            filePath=sub_row.get("file_path"),
-            fileType=sub_row.get("file_type"),
-            submittedAt=sub_row.get("submitted_at"),
-            status=sub_row["status"],
-            notes=sub_row.get("student_notes"),
-            grade=fb_row.get("grade") if fb_row else None,
-            reviewerId=fb_row.get("doctor_id") if fb_row else None,
+        # Build the payload from the in-memory rows (flushed, so a new feedback
+        # has its id/created_at) before commit expires them
+        db.flush()
+        department = sub.assignment.department
+        submission = SubmissionListItem.model_construct(
+            id=sub.submission_id,
+            assignmentId=sub.assignment_id,
+            studentId=sub.student_id,
+            title=sub.assignment.title,
+            course=department.name if department else None,
+            fileName=sub.original_filename,
+            filePath=sub.file_path,
+            fileType=sub.file_type,
+            submittedAt=sub.submitted_at,
+            status=sub.status,
+            notes=sub.student_notes,
+            grade=fb.grade if fb else None,
+            reviewerId=fb.doctor_id if fb else None,
         )
         feedback = None
-        if fb_row:
-            feedback = FeedbackRead(
-                id=fb_row["feedback_id"],
-                doctorId=fb_row.get("doctor_id"),
-                text=fb_row.get("feedback_text"),
-                grade=fb_row.get("grade"),
-                createdAt=fb_row.get("created_at"),
+        if fb:
+            feedback = FeedbackRead.model_construct(
+                id=fb.feedback_id,
+                doctorId=fb.doctor_id,
+                text=fb.feedback_text,
+                grade=fb.grade,
+                createdAt=fb.created_at,
             )
 
-        return SubmissionDetailResponse(submission=submission, feedback=feedback)
+        db.commit()
+        _list_cache.clear()
+        return SubmissionDetailResponse.model_construct(submission=submission, feedback=feedback)
 
     except IntegrityError:
         db.rollback()
@@ -530,6 +700,19 @@ def update_submission_status(
         raise HTTPException(status_code=500, detail="Failed to update submission status")
 
 
+def _cleanup_file(public_path: str) -> None:
+    """Remove a deleted submission's file if it lives under UPLOAD_DIR."""
+    try:
+        disk = _disk_path_from_public(public_path)
+        if disk.is_file():
+            # ensure path is inside UPLOAD_DIR
+            if disk.resolve().is_relative_to(_UPLOAD_DIR_RESOLVED):
+                disk.unlink()
+    except Exception:
+        # Don't fail anything for disk cleanup issues
+        pass
+
+
 @router.delete(
     "/{submission_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -537,6 +720,7 @@ def update_submission_status(
 )
 def delete_submission(
     submission_id: int,
+    background_tasks: BackgroundTasks,
     delete_file: bool = Query(True, description="Also remove file from disk if under UPLOAD_DIR"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
@@ -551,19 +735,16 @@ def delete_submission(
 
     old_public = sub.file_path
     try:
+        # Feedback first: its submission_id is NOT NULL, so the ORM can't orphan it
+        if sub.feedback is not None:
+            db.delete(sub.feedback)
         db.delete(sub)
         db.commit()
+        _list_cache.clear()
 
+        # Disk cleanup runs after the 204 is sent
         if delete_file and old_public:
-            try:
-                disk = _disk_path_from_public(old_public)
-                if disk.is_file():
-                    # ensure path is inside UPLOAD_DIR
-                    if disk.resolve().is_relative_to(UPLOAD_DIR.resolve()):
-                        disk.unlink()
-            except Exception:
-                # Don't fail the request for disk cleanup issues
-                pass
+            background_tasks.add_task(_cleanup_file, old_public)
         return
     except Exception:
         db.rollback()
@@ -581,23 +762,19 @@ def submissions_stats(
 ):
     _require_admin_or_doctor(current_user)
 
-    q = db.query(models.Submission)
-    if _is_doctor(current_user):
-        # Restrict to 'mine' when schema supports it
-        # We cannot easily express the dynamic doctor filter with ORM across many column names,
-        # so we approximate with the most common names.
-        if _has_attr(models.Submission, "doctor_id"):
-            q = q.filter(models.Submission.doctor_id == current_user.id)
-        elif _has_attr(models.Submission, "assigned_doctor_id"):
-            q = q.filter(models.Submission.assigned_doctor_id == current_user.id)
-        elif _has_attr(models.Submission, "reviewer_id"):
-            q = q.filter(models.Submission.reviewer_id == current_user.id)
-        # else: no restriction
-
-    total = q.count()
+    # Restrict to 'mine' via _DOCTOR_FILTER: a doctor column on Submission, else one on
+    # Assignment, else an EXISTS on the assignment creator's Doctor.user_id
+    if _is_doctor(current_user) and mine_only and _STATS_MINE_SQL is not None:
+        rows = db.execute(_STATS_MINE_SQL, {"docid": current_user.id}).all()
+    else:
+        # One grouped scan instead of a COUNT per status
+        rows = db.execute(_STATS_SQL).all()
     by_status = {s: 0 for s in VALID_STATUSES}
-    for s in VALID_STATUSES:
-        by_status[s] = q.filter(models.Submission.status == s).count()
+    total = 0
+    for status_val, c in rows:
+        if status_val in by_status:
+            by_status[status_val] = c
+        total += c
 
     return {
         "total": total,
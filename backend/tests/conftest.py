@@ -0,0 +1,115 @@
+# tests/conftest.py
+"""
+Shared fixtures: the app runs against a fresh SQLite file built from the models,
+so tests never touch database/dentist.db; uploads go to a temp UPLOAD_DIR.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="dentist-tests-"))
+
+# Must be set before core.config reads the settings and app.db builds its engine
+os.environ["DATABASE_URL"] = f"sqlite:///{(_TMP_DIR / 'test.db').as_posix()}"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["UPLOAD_DIR"] = str(_TMP_DIR / "uploads")
+os.chdir(BACKEND_DIR)
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import models  # noqa: E402
+from app.db import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from core.security import create_access_token  # noqa: E402
+from routers import students  # noqa: E402
+from utils.ttl_cache import assignment_window_cache, submission_list_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _schema():
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+    # Ids restart with every schema, so cached rows would leak between tests
+    submission_list_cache.clear()
+    assignment_window_cache.clear()
+    for path in students.UPLOAD_DIR.iterdir():
+        path.unlink()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def auth_headers(user: models.User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+
+def make_user(db, username: str, role: str) -> models.User:
+    user = models.User(username=username, email=f"{username}@example.com", password_hash="x", role=role)
+    db.add(user)
+    db.flush()
+    return user
+
+
+def make_doctor(db, username: str, department_id: int) -> models.User:
+    user = make_user(db, username, "doctor")
+    db.add(models.Doctor(full_name=username, department_id=department_id, user_id=user.id))
+    db.flush()
+    return user
+
+
+@pytest.fixture
+def department(db):
+    dept = models.Department(name="Prosthodontics")
+    db.add(dept)
+    db.commit()
+    return dept
+
+
+@pytest.fixture
+def make_submission(db, department):
+    """Submission for an assignment created by `doctor_user`."""
+    assignment_type = models.AssignmentType(name="Case", allowed_file_types=".pdf")
+    db.add(assignment_type)
+    db.flush()
+
+    def _make(doctor_user: models.User, student_number: str = "1001") -> models.Submission:
+        doctor = db.query(models.Doctor).filter(models.Doctor.user_id == doctor_user.id).one()
+        assignment = models.Assignment(
+            title="Crown prep",
+            type_id=assignment_type.type_id,
+            department_id=department.department_id,
+            created_by=doctor.doctor_id,
+            deadline=datetime.utcnow() + timedelta(days=7),
+        )
+        student = models.Student(student_number=student_number, full_name="Test Student")
+        db.add_all([assignment, student])
+        db.flush()
+        sub = models.Submission(
+            assignment_id=assignment.assignment_id,
+            student_id=student.student_id,
+            original_filename="case.pdf",
+            file_path="/uploads/does-not-exist.pdf",
+        )
+        db.add(sub)
+        db.commit()
+        return sub
+
+    return _make
@@ -0,0 +1,62 @@
+# tests/test_search_fts.py
+"""The FTS5 search tables are picked up once create_indexes.py adds them, without a restart."""
+import pytest
+from conftest import auth_headers, make_doctor, make_user
+from create_indexes import ASSIGNMENT_SEARCH_DDL, STUDENT_SEARCH_DDL
+
+from app import models
+from app.db import engine
+from routers import student_management, submissions
+
+
+def _run_script(ddl: str):
+    conn = engine.raw_connection()
+    try:
+        conn.driver_connection.executescript(ddl)
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def search_table(monkeypatch):
+    monkeypatch.setattr(student_management, "_student_search_fts", False)
+    monkeypatch.setattr(submissions, "_assignment_search_fts", False)
+    yield _run_script
+    _run_script("DROP TABLE IF EXISTS StudentSearch; DROP TABLE IF EXISTS AssignmentSearch;")
+
+
+def test_student_search_starts_using_fts_once_it_exists(client, db, search_table):
+    doctor = make_user(db, "doctor", "doctor")
+    db.add(models.Student(student_number="DS2024001", full_name="Sarah Wilson"))
+    db.commit()
+
+    def search():
+        resp = client.get("/student-management/students", params={"search": "wils"}, headers=auth_headers(doctor))
+        assert resp.status_code == 200
+        return [s["student_number"] for s in resp.json()]
+
+    assert search() == ["DS2024001"]
+    assert student_management._student_search_fts is False
+
+    search_table(STUDENT_SEARCH_DDL)
+    assert search() == ["DS2024001"]
+    assert student_management._student_search_fts is True
+
+
+def test_assignment_search_starts_using_fts_once_it_exists(client, db, department, make_submission, search_table):
+    doctor = make_doctor(db, "doctor", department.department_id)
+    sub = make_submission(doctor)
+
+    def search():
+        resp = client.get("/submissions", params={"search": "crown"}, headers=auth_headers(doctor))
+        assert resp.status_code == 200
+        return [item["id"] for item in resp.json()]
+
+    assert search() == [sub.submission_id]
+    assert submissions._assignment_search_fts is False
+
+    search_table(ASSIGNMENT_SEARCH_DDL)
+    # The list is cached per query; only the probe is under test here
+    submissions._list_cache.clear()
+    assert search() == [sub.submission_id]
+    assert submissions._assignment_search_fts is True
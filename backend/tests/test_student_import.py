@@ -0,0 +1,51 @@
+# tests/test_student_import.py
+"""POST /student-management/students/bulk-import"""
+from conftest import BACKEND_DIR, auth_headers, make_user
+from sqlalchemy import text
+
+from app import models
+from routers import student_management
+
+SAMPLE_FILE = BACKEND_DIR.parent / "sample_students_import.txt"
+
+
+def _import(client, user, content: bytes):
+    files = {"file": ("students.txt", content, "text/plain")}
+    return client.post("/student-management/students/bulk-import", files=files, headers=auth_headers(user))
+
+
+def test_imports_repo_sample_with_mixed_delimiters(client, db):
+    doctor = make_user(db, "doctor", "doctor")
+    db.commit()
+
+    resp = _import(client, doctor, SAMPLE_FILE.read_bytes())
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["errors"] == []
+    assert (body["imported"], body["skipped"], body["total_processed"]) == (7, 0, 7)
+    numbers = {n for (n,) in db.query(models.Student.student_number)}
+    assert numbers == {f"DS202400{i}" for i in range(1, 8)}
+    sarah = db.query(models.Student).filter(models.Student.student_number == "DS2024004").one()
+    assert (sarah.full_name, sarah.year_level, sarah.graduation_year) == ("Sarah Wilson", "Fourth", 2024)
+
+
+def test_failed_chunk_is_rolled_back_and_reported(client, db, monkeypatch):
+    doctor = make_user(db, "doctor", "doctor")
+    db.execute(text(
+        "CREATE TRIGGER reject_boom BEFORE INSERT ON Student WHEN NEW.full_name = 'Boom' "
+        "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+    ))
+    db.commit()
+    monkeypatch.setattr(student_management, "_IMPORT_CHUNK_SIZE", 2)
+
+    content = b"Ann,S1\nBob,S2\nCid,S3\nBoom,S4\nEve,S5\n"
+    resp = _import(client, doctor, content)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    # Chunk [S3, S4] fails at commit; the chunks before and after are kept
+    assert (body["imported"], body["total_processed"]) == (3, 5)
+    assert [e.split(":")[0] for e in body["errors"]] == ["Line 3", "Line 4"]
+    numbers = {n for (n,) in db.query(models.Student.student_number)}
+    assert numbers == {"S1", "S2", "S5"}
@@ -0,0 +1,56 @@
+# tests/test_student_profile.py
+"""Profile reads reflect edits made through other routers and other workers, including relinks."""
+from conftest import auth_headers, make_user
+
+from app import models
+
+
+def test_profile_reflects_student_management_edits(client, db):
+    doctor = make_user(db, "doctor", "doctor")
+    student = models.Student(student_number="S1", full_name="Old Name")
+    db.add(student)
+    db.commit()
+    headers = auth_headers(doctor)
+
+    assert client.get(f"/student-profile/{student.student_id}", headers=headers).json()["full_name"] == "Old Name"
+    resp = client.put(
+        f"/student-management/students/{student.student_id}", json={"full_name": "New Name"}, headers=headers
+    )
+    assert resp.status_code == 200
+    assert client.get(f"/student-profile/{student.student_id}", headers=headers).json()["full_name"] == "New Name"
+
+
+def test_academic_info_reflects_gpa_written_elsewhere(client, db):
+    doctor = make_user(db, "doctor", "doctor")
+    student = models.Student(student_number="S1", full_name="Ann", gpa=3.0)
+    db.add(student)
+    db.commit()
+    headers = auth_headers(doctor)
+    url = f"/student-profile/{student.student_id}/academic-info"
+
+    assert client.get(url, headers=headers).json()["overall_gpa"] == 3.0
+    # Another worker (or a script) writing straight to the database
+    student.gpa = 3.5
+    db.commit()
+    assert client.get(url, headers=headers).json()["overall_gpa"] == 3.5
+
+
+def test_me_follows_a_student_recreated_for_the_same_user(client, db):
+    doctor = make_user(db, "doctor", "doctor")
+    user = make_user(db, "S1", "student")
+    old = models.Student(student_number="S1", full_name="Ann", user_id=user.id)
+    # A later row, so the recreated student cannot reuse the deleted student_id
+    db.add_all([old, models.Student(student_number="S2", full_name="Bob")])
+    db.commit()
+
+    assert client.get("/student-profile/me", headers=auth_headers(user)).json()["student_id"] == old.student_id
+    headers = auth_headers(doctor)
+    assert client.delete(f"/student-management/students/{old.student_id}", headers=headers).status_code == 204
+    # Created again: linked to the same user by username
+    resp = client.post("/student-management/students", json={"student_number": "S1", "full_name": "Ann"}, headers=headers)
+    assert resp.status_code == 201
+    new_id = resp.json()["student_id"]
+
+    resp = client.get("/student-profile/me", headers=auth_headers(user))
+    assert resp.status_code == 200
+    assert resp.json()["student_id"] == new_id != old.student_id
@@ -0,0 +1,60 @@
+# tests/test_student_update.py
+"""PUT /student-management/students/{id}"""
+import pytest
+from conftest import auth_headers, make_user
+from sqlalchemy import text
+
+from app import models
+
+
+@pytest.fixture
+def put(client, db):
+    doctor = make_user(db, "doctor", "doctor")
+    db.add_all([
+        models.Student(student_number="S1", full_name="Ann"),
+        models.Student(student_number="S2", full_name="Bob"),
+    ])
+    db.commit()
+
+    def _put(student_number, body):
+        student_id = db.scalar(
+            text("SELECT student_id FROM Student WHERE student_number = :n"), {"n": student_number}
+        )
+        return client.put(f"/student-management/students/{student_id}", json=body, headers=auth_headers(doctor))
+
+    return _put
+
+
+@pytest.mark.parametrize("body", [
+    {"full_name": None},
+    {"student_number": ""},
+    {"year_level": None},
+    {"status": "  "},
+])
+def test_explicit_empty_required_field_is_400(put, body):
+    resp = put("S1", body)
+    assert resp.status_code == 400
+    assert "already exists" not in resp.json()["detail"]
+
+
+def test_duplicate_student_number(put):
+    resp = put("S1", {"student_number": "S2"})
+    assert (resp.status_code, resp.json()["detail"]) == (400, "Student number already exists")
+
+
+def test_other_constraint_failures_are_not_reported_as_duplicates(put, db):
+    db.execute(text(
+        "CREATE TRIGGER reject_notes BEFORE UPDATE OF notes ON Student WHEN NEW.notes = 'boom' "
+        "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+    ))
+    db.commit()
+
+    resp = put("S1", {"student_number": "S9", "notes": "boom"})
+    assert resp.status_code == 400
+    assert resp.json()["detail"] != "Student number already exists"
+
+
+def test_nullable_fields_can_still_be_cleared(put):
+    resp = put("S1", {"email": None, "notes": ""})
+    assert resp.status_code == 200
+    assert resp.json()["email"] is None
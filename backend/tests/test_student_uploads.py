@@ -0,0 +1,104 @@
+# tests/test_student_uploads.py
+"""Student submission routes under /student/submissions: streaming uploads and reads."""
+from datetime import datetime, timedelta
+
+import pytest
+from conftest import auth_headers, make_doctor, make_user
+
+from app import models
+from routers import students
+
+
+def _upload(client, user, url, method="post", **data):
+    files = {"file": ("case.pdf", b"%PDF-1.4 test", "application/pdf")}
+    return client.request(method, url, data=data, files=files, headers=auth_headers(user))
+
+
+def _upload_dir_names():
+    return sorted(path.name for path in students.UPLOAD_DIR.iterdir())
+
+
+@pytest.fixture
+def assignment_id(db, department, make_submission):
+    doctor = make_doctor(db, "doctor", department.department_id)
+    return make_submission(doctor).assignment_id
+
+
+def test_create_and_replace_publish_the_file(client, db, assignment_id):
+    student = make_user(db, "student", "student")
+    db.commit()
+
+    resp = _upload(client, student, "/student/submissions", assignment_id=str(assignment_id))
+    assert resp.status_code == 201
+    first = resp.json()["fileUrl"].rsplit("/", 1)[1]
+    assert _upload_dir_names() == [first]
+
+    resp = _upload(client, student, f"/student/submissions/{resp.json()['id']}/file", method="patch")
+    assert resp.status_code == 200
+    # The old file is replaced, not kept next to the new one
+    assert _upload_dir_names() == [resp.json()["fileUrl"].rsplit("/", 1)[1]]
+
+
+def test_create_discards_the_file_on_http_error(client, db, assignment_id):
+    student = make_user(db, "student", "student")
+    db.commit()
+
+    resp = _upload(client, student, "/student/submissions", assignment_id=str(assignment_id + 1))
+    assert resp.status_code == 404
+    assert _upload_dir_names() == []
+
+
+def test_create_discards_the_file_on_unexpected_error(client, db, assignment_id, monkeypatch):
+    student = make_user(db, "student", "student")
+    db.commit()
+
+    def broken_insert(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(students, "_insert_submission", broken_insert)
+    with pytest.raises(RuntimeError):
+        _upload(client, student, "/student/submissions", assignment_id=str(assignment_id))
+    assert _upload_dir_names() == []
+
+
+def test_detail_has_no_list_only_keys(client, db, assignment_id):
+    student = make_user(db, "student", "student")
+    db.commit()
+    created = _upload(client, student, "/student/submissions", assignment_id=str(assignment_id)).json()
+
+    listed = client.get("/student/submissions", headers=auth_headers(student)).json()
+    assert listed[0]["totalCount"] == 1
+    detail = client.get(f"/student/submissions/{created['id']}", headers=auth_headers(student)).json()
+    assert "totalCount" not in detail
+    assert {**detail, "totalCount": 1} == listed[0]
+
+
+@pytest.mark.parametrize("size", [0, 3 * students.WRITE_BUFFER_SIZE + 123])
+def test_uploaded_bytes_are_stored_exactly(client, db, assignment_id, size):
+    student = make_user(db, "student", "student")
+    db.commit()
+    payload = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+
+    files = {"file": ("case.pdf", payload, "application/pdf")}
+    resp = client.post(
+        "/student/submissions", data={"assignment_id": str(assignment_id)}, files=files,
+        headers=auth_headers(student),
+    )
+    assert resp.status_code == 201
+    stored = students.UPLOAD_DIR / resp.json()["fileUrl"].rsplit("/", 1)[1]
+    assert stored.read_bytes() == payload
+
+
+def test_a_shortened_deadline_closes_the_window_at_once(client, db, assignment_id):
+    doctor = db.query(models.User).filter_by(username="doctor").one()
+    student = make_user(db, "student", "student")
+    db.commit()
+    # The first upload caches the assignment's window
+    assert _upload(client, student, "/student/submissions", assignment_id=str(assignment_id)).status_code == 201
+
+    past = (datetime.utcnow() - timedelta(hours=1)).isoformat()
+    resp = client.put(f"/assignments/{assignment_id}", json={"deadline": past}, headers=auth_headers(doctor))
+    assert resp.status_code == 200
+    other = make_user(db, "student2", "student")
+    db.commit()
+    assert _upload(client, other, "/student/submissions", assignment_id=str(assignment_id)).status_code == 400
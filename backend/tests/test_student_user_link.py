@@ -0,0 +1,43 @@
+# tests/test_student_user_link.py
+"""Student.user_id is unique: a user already linked to another student is a conflict."""
+from conftest import auth_headers, make_user
+
+from app import models
+
+
+def _linked_user(db):
+    # User "S1" is linked to a student whose number was later changed
+    user = make_user(db, "S1", "student")
+    db.add(models.Student(student_number="RENAMED", full_name="Ann", user_id=user.id))
+    db.commit()
+    return user
+
+
+def test_create_student_conflicting_link_is_409(client, db):
+    doctor = make_user(db, "doctor", "doctor")
+    _linked_user(db)
+
+    resp = client.post(
+        "/student-management/students",
+        json={"student_number": "S1", "full_name": "Bob"},
+        headers=auth_headers(doctor),
+    )
+
+    assert resp.status_code == 409
+    assert "RENAMED" in resp.json()["detail"]
+    assert db.query(models.Student).filter(models.Student.student_number == "S1").count() == 0
+
+
+def test_bulk_import_conflicting_link_is_a_row_error(client, db):
+    doctor = make_user(db, "doctor", "doctor")
+    _linked_user(db)
+    files = {"file": ("students.txt", b"Bob,S1\nCid,S2\n", "text/plain")}
+
+    resp = client.post("/student-management/students/bulk-import", files=files, headers=auth_headers(doctor))
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["imported"], body["total_processed"]) == (1, 2)
+    assert len(body["errors"]) == 1 and body["errors"][0].startswith("Line 1:")
+    numbers = {n for (n,) in db.query(models.Student.student_number)}
+    assert numbers == {"RENAMED", "S2"}
@@ -0,0 +1,60 @@
+# tests/test_submission_list_cache.py
+"""GET /submissions is cached; writes to what it shows must clear it."""
+from conftest import auth_headers, make_doctor, make_user
+
+from utils.ttl_cache import TTLCache
+
+
+def _listed_ids(client, doctor):
+    resp = client.get("/submissions", headers=auth_headers(doctor))
+    assert resp.status_code == 200
+    return {item["id"] for item in resp.json()}
+
+
+def test_student_upload_and_delete_show_up_in_doctor_list(client, db, department, make_submission):
+    doctor = make_doctor(db, "doctor", department.department_id)
+    student = make_user(db, "student", "student")
+    db.commit()
+    assignment_id = make_submission(doctor).assignment_id
+    before = _listed_ids(client, doctor)
+
+    files = {"file": ("case.pdf", b"%PDF-1.4 test", "application/pdf")}
+    resp = client.post(
+        "/student/submissions", data={"assignment_id": str(assignment_id)}, files=files,
+        headers=auth_headers(student),
+    )
+    assert resp.status_code == 201
+    new_id = resp.json()["id"]
+    assert _listed_ids(client, doctor) == before | {new_id}
+
+    assert client.delete(f"/student/submissions/{new_id}", headers=auth_headers(student)).status_code == 204
+    assert _listed_ids(client, doctor) == before
+
+
+def _listed(client, doctor, key):
+    resp = client.get("/submissions", headers=auth_headers(doctor))
+    assert resp.status_code == 200
+    return [item[key] for item in resp.json()]
+
+
+def test_assignment_and_department_renames_show_up_in_doctor_list(client, db, department, make_submission):
+    doctor = make_doctor(db, "doctor", department.department_id)
+    sub = make_submission(doctor)
+    headers = auth_headers(doctor)
+    assert _listed(client, doctor, "title") == ["Crown prep"]
+    assert _listed(client, doctor, "course") == ["Prosthodontics"]
+
+    resp = client.put(f"/assignments/{sub.assignment_id}", json={"title": "Bridge prep"}, headers=headers)
+    assert resp.status_code == 200
+    assert _listed(client, doctor, "title") == ["Bridge prep"]
+
+    resp = client.put(f"/departments/{department.department_id}", json={"name": "Endodontics"}, headers=headers)
+    assert resp.status_code == 200
+    assert _listed(client, doctor, "course") == ["Endodontics"]
+
+
+def test_a_disabled_cache_stores_nothing():
+    # What the caches become under several workers (WEB_CONCURRENCY > 1)
+    cache = TTLCache(maxsize=8, ttl=60, enabled=False)
+    cache.set("key", [1])
+    assert cache.get("key") is None
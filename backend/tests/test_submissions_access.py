@@ -0,0 +1,59 @@
+# tests/test_submissions_access.py
+"""Doctors only see and manage submissions for assignments they created."""
+from conftest import auth_headers, make_doctor, make_user
+
+
+def test_doctor_cannot_read_other_doctors_submission(client, db, department, make_submission):
+    owner = make_doctor(db, "owner", department.department_id)
+    other = make_doctor(db, "other", department.department_id)
+    sub = make_submission(owner)
+
+    assert client.get(f"/submissions/{sub.submission_id}", headers=auth_headers(owner)).status_code == 200
+    assert client.get(f"/submissions/{sub.submission_id}", headers=auth_headers(other)).status_code == 403
+
+
+def test_doctor_cannot_download_other_doctors_submission(client, db, department, make_submission):
+    owner = make_doctor(db, "owner", department.department_id)
+    other = make_doctor(db, "other", department.department_id)
+    sub = make_submission(owner)
+
+    # The owner gets past the check (the stored file is missing, hence 404)
+    assert client.get(f"/submissions/{sub.submission_id}/file", headers=auth_headers(owner)).status_code == 404
+    assert client.get(f"/submissions/{sub.submission_id}/file", headers=auth_headers(other)).status_code == 403
+
+
+def test_doctor_cannot_grade_other_doctors_submission(client, db, department, make_submission):
+    owner = make_doctor(db, "owner", department.department_id)
+    other = make_doctor(db, "other", department.department_id)
+    sub = make_submission(owner)
+    body = {"status": "Rejected"}
+
+    resp = client.patch(f"/submissions/{sub.submission_id}/status", json=body, headers=auth_headers(other))
+    assert resp.status_code == 403
+    resp = client.patch(f"/submissions/{sub.submission_id}/status", json=body, headers=auth_headers(owner))
+    assert resp.status_code == 200
+
+
+def test_admin_is_not_scoped(client, db, department, make_submission):
+    owner = make_doctor(db, "owner", department.department_id)
+    admin = make_user(db, "admin", "admin")
+    db.commit()
+    sub = make_submission(owner)
+
+    assert client.get(f"/submissions/{sub.submission_id}", headers=auth_headers(admin)).status_code == 200
+
+
+def test_doctor_router_applies_the_same_scope(client, db, department, make_submission):
+    owner = make_doctor(db, "owner", department.department_id)
+    other = make_doctor(db, "other", department.department_id)
+    sub = make_submission(owner)
+    url = f"/doctor/submissions/{sub.submission_id}"
+
+    assert [row["id"] for row in client.get("/doctor/submissions", headers=auth_headers(owner)).json()] == [sub.submission_id]
+    assert client.get("/doctor/submissions", headers=auth_headers(other)).json() == []
+    assert client.get(url, headers=auth_headers(owner)).status_code == 200
+    assert client.get(url, headers=auth_headers(other)).status_code == 403
+
+    body = {"status": "Rejected"}
+    assert client.post(f"{url}/review", json=body, headers=auth_headers(other)).status_code == 403
+    assert client.post(f"{url}/review", json=body, headers=auth_headers(owner)).status_code == 200
@@ -0,0 +1,34 @@
+# tests/test_submissions_cursor.py
+"""Keyset pages of the submissions list cover every row exactly once."""
+import pytest
+from sqlalchemy import text
+
+from conftest import auth_headers, make_doctor, make_user
+
+
+def _walk(client, headers, order_dir: str, limit: int) -> list:
+    params = {"order_by": "submitted_at", "order_dir": order_dir, "limit": limit}
+    seen = []
+    for _ in range(10):
+        resp = client.get("/submissions", params=params, headers=headers)
+        assert resp.status_code == 200
+        seen += [row["id"] for row in resp.json()]
+        if "X-Next-Cursor" not in resp.headers:
+            return seen
+        params["cursor"] = resp.headers["X-Next-Cursor"]
+    pytest.fail(f"cursor never ran out: {seen}")
+
+
+@pytest.mark.parametrize("limit", [1, 2])
+@pytest.mark.parametrize("order_dir", ["asc", "desc"])
+def test_pages_through_rows_sharing_one_timestamp(client, db, department, make_submission, order_dir, limit):
+    owner = make_doctor(db, "owner", department.department_id)
+    admin = make_user(db, "admin", "admin")
+    db.commit()
+    ids = [make_submission(owner, str(1000 + n)).submission_id for n in range(3)]
+    # CURRENT_TIMESTAMP's format: no fractional seconds, unlike timestamps bound by the ORM
+    db.execute(text("UPDATE Submission SET submitted_at = '2026-01-01 09:00:00'"))
+    db.commit()
+
+    expected = sorted(ids, reverse=order_dir == "desc")
+    assert _walk(client, auth_headers(admin), order_dir, limit) == expected
@@ -0,0 +1,118 @@
+# tests/test_tus_uploads.py
+"""Resumable (tus) uploads under /student/submissions/tus."""
+import base64
+import os
+import time
+
+import pytest
+from conftest import auth_headers, make_doctor, make_user
+
+from app import models
+
+from routers import students
+
+TUS = {"Tus-Resumable": students.TUS_VERSION}
+CHUNK = {**TUS, "Content-Type": "application/offset+octet-stream"}
+
+
+def _b64(value: str) -> str:
+    return base64.b64encode(value.encode()).decode()
+
+
+@pytest.fixture
+def student(db):
+    user = make_user(db, "student", "student")
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def assignment_id(db, department, make_submission):
+    doctor = make_doctor(db, "doctor", department.department_id)
+    return make_submission(doctor).assignment_id
+
+
+def _create_headers(student, assignment_id):
+    return {
+        **TUS,
+        **auth_headers(student),
+        "Upload-Length": "8",
+        "Upload-Metadata": f"filename {_b64('case.pdf')},assignment_id {_b64(str(assignment_id))}",
+    }
+
+
+@pytest.fixture
+def upload_url(client, student, assignment_id):
+    resp = client.post("/student/submissions/tus?x=1", headers=_create_headers(student, assignment_id))
+    assert resp.status_code == 201
+    return resp.headers["Location"]
+
+
+def test_location_is_a_path(upload_url):
+    assert upload_url.startswith("/student/submissions/tus/")
+    assert "?" not in upload_url
+
+
+def test_chunks_complete_the_submission(client, student, upload_url):
+    headers = {**CHUNK, **auth_headers(student)}
+    resp = client.patch(upload_url, content=b"%PDF", headers={**headers, "Upload-Offset": "0"})
+    assert (resp.status_code, resp.headers["Upload-Offset"]) == (204, "4")
+    resp = client.patch(upload_url, content=b"-1.4", headers={**headers, "Upload-Offset": "4"})
+    assert resp.status_code == 204
+    assert "X-Submission-Id" in resp.headers
+    # Only the published file is left; the data, metadata and lock files are gone
+    names = [path.name for path in students.UPLOAD_DIR.iterdir()]
+    assert len(names) == 1 and names[0].endswith("_case.pdf")
+
+
+def test_patch_is_refused_while_another_holds_the_lock(client, student, upload_url):
+    upload_id = upload_url.rsplit("/", 1)[1]
+    lock_path = students.UPLOAD_DIR / f".tus_{upload_id}.lock"
+    lock_path.touch()
+
+    headers = {**CHUNK, **auth_headers(student), "Upload-Offset": "0"}
+    assert client.patch(upload_url, content=b"%PDF", headers=headers).status_code == 423
+    assert lock_path.exists()
+
+    # A lock left behind by a crashed worker stops counting once it is stale
+    stale = time.time() - students.TUS_LOCK_STALE_SECONDS - 1
+    os.utime(lock_path, (stale, stale))
+    assert client.patch(upload_url, content=b"%PDF", headers=headers).status_code == 204
+    assert not lock_path.exists()
+
+
+def test_abandoned_uploads_are_swept_and_open_uploads_capped(client, student, assignment_id, upload_url, monkeypatch):
+    upload_id = upload_url.rsplit("/", 1)[1]
+    data_path = students.UPLOAD_DIR / f".tus_{upload_id}"
+    (students.UPLOAD_DIR / f".tus_{upload_id}.lock").touch()
+    monkeypatch.setattr(students, "TUS_MAX_OPEN_UPLOADS", 1)
+    headers = _create_headers(student, assignment_id)
+
+    assert client.post("/student/submissions/tus", headers=headers).status_code == 429
+
+    stale = time.time() - students.TUS_UPLOAD_TTL_SECONDS - 1
+    os.utime(data_path, (stale, stale))
+    assert client.post("/student/submissions/tus", headers=headers).status_code == 201
+    # Data, metadata and lock of the abandoned upload are gone
+    assert not any(path.name.startswith(f".tus_{upload_id}") for path in students.UPLOAD_DIR.iterdir())
+
+
+def test_failed_move_leaves_no_submission(client, db, student, upload_url, monkeypatch):
+    def broken_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(students.os, "replace", broken_replace)
+    headers = {**CHUNK, **auth_headers(student), "Upload-Offset": "0"}
+    with pytest.raises(OSError):
+        client.patch(upload_url, content=b"%PDF-1.4", headers=headers)
+    # Only the fixture's own submission exists; the upload can be retried
+    assert db.query(models.Submission).count() == 1
+    monkeypatch.undo()
+    assert client.head(upload_url, headers={**TUS, **auth_headers(student)}).headers["Upload-Offset"] == "8"
+
+
+def test_head_is_404_once_the_data_file_is_gone(client, student, upload_url):
+    # What HEAD sees when a concurrent PATCH finishes the upload right after _tus_load
+    upload_id = upload_url.rsplit("/", 1)[1]
+    (students.UPLOAD_DIR / f".tus_{upload_id}").unlink()
+    assert client.head(upload_url, headers={**TUS, **auth_headers(student)}).status_code == 404
@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Small thread-safe in-process cache whose entries expire after ``ttl`` seconds.
+
+    When ``maxsize`` is reached the cache is simply emptied; it is meant for hot,
+    cheap-to-recompute lookups, not as a general store. A disabled cache stores
+    nothing, so every ``get`` misses.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, enabled: bool = True):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled
+        self._data: Dict[Hashable, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            hit = self._data.get(key)
+        if hit is None or hit[1] <= time.monotonic():
+            return default
+        return hit[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            if len(self._data) >= self.maxsize and key not in self._data:
+                self._data.clear()
+            self._data[key] = (value, expires_at)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            hit = self._data.pop(key, None)
+        return hit[0] if hit else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# clear() and pop() only reach this process. With several workers a write handled by one
+# of them would leave the others serving stale entries until the TTL, and there is no
+# shared store to invalidate through (the same reason the student-profile GETs are not
+# cached). The caches below that follow writes are therefore off under several workers:
+# WEB_CONCURRENCY > 1, which uvicorn --workers defaults to and app.main exports.
+_SINGLE_WORKER = int(os.getenv("WEB_CONCURRENCY") or 1) <= 1
+
+# list_submissions results (routers/submissions.py). Cleared by every route that changes
+# what the list shows: Submission and feedback writes (submissions, students, doctor and
+# feedback routers), assignment updates, and department updates and deletes.
+# Single-submission reads are never cached.
+submission_list_cache = TTLCache(maxsize=512, ttl=30, enabled=_SINGLE_WORKER)
+
+# assignment_id -> (starts, ends) for uploads (routers/students.py). Only existing
+# assignments are cached, and the window is re-checked against the clock on every call.
+# Assignment updates and deletes pop their entry, so an edited deadline or a deleted
+# assignment is seen by the next upload.
+assignment_window_cache = TTLCache(maxsize=1024, ttl=60, enabled=_SINGLE_WORKER)
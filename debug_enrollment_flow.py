@@ -2,92 +2,119 @@
 """
 Debug script to trace the complete enrollment flow and identify ID mismatches
 """
-import sqlite3
-import sys
-from pathlib import Path
+from debug_lib import db, stream
+
+# Every section of the report in one statement, tagged by section and emitted in
+# report order. Each arm pads its columns to the same width; FLOW_FIELDS names them.
+FLOW_SQL = """
+    WITH recent AS (
+        -- Newest enrollments first; walks ix_enrollment_enrolled_at instead of sorting
+        SELECT ce.enrollment_id, ce.student_id, ce.course_id, ce.status, ce.enrolled_at,
+               s.student_number, s.full_name, s.user_id
+        FROM CourseEnrollment ce
+        LEFT JOIN Student s ON ce.student_id = s.student_id
+        ORDER BY ce.enrolled_at DESC
+        LIMIT ?
+    )
+    SELECT 'user', id, username, email, NULL, NULL, NULL, NULL, NULL
+    FROM users WHERE role = 'student'
+    UNION ALL
+    SELECT 'student', s.student_id, s.student_number, s.full_name, s.user_id, u.username, u.email, NULL, NULL
+    FROM Student s
+    LEFT JOIN users u ON s.user_id = u.id
+    WHERE u.role = 'student' OR s.user_id IS NOT NULL
+    UNION ALL
+    SELECT 'enrollment', * FROM recent
+    UNION ALL
+    SELECT 'same_user', student_id, student_number, full_name, NULL, NULL, NULL, NULL, NULL
+    FROM Student WHERE user_id = (SELECT user_id FROM recent LIMIT 1)
+    UNION ALL
+    SELECT 'orphan', student_id, student_number, full_name, NULL, NULL, NULL, NULL, NULL
+    FROM Student WHERE user_id IS NULL
+"""
+FLOW_FIELDS = {
+    "user": ("id", "username", "email"),
+    "student": ("student_id", "student_number", "full_name", "user_id", "username", "email"),
+    "enrollment": ("enrollment_id", "student_id", "course_id", "status", "enrolled_at",
+                   "student_number", "full_name", "user_id"),
+    "same_user": ("student_id", "student_number", "full_name"),
+    "orphan": ("student_id", "student_number", "full_name"),
+}
+SECTIONS = tuple(FLOW_FIELDS)
+ENROLLMENT_LISTING_LIMIT = 50
 
 def debug_enrollment_flow():
-    db_path = "database/dentist.db"
-    
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        print("=== DEBUGGING ENROLLMENT FLOW ===\n")
-        
+        with db() as conn:
+            _debug_enrollment_flow(conn)
+    except Exception as e:
+        print(f"Error: {e}")
+
+def _print_section_header(section, recent_enrollment):
+    if section == "user":
         # 1. Check all users with student role
         print("1. Users with student role:")
-        cursor.execute("SELECT id, username, email, role FROM users WHERE role = 'student'")
-        student_users = cursor.fetchall()
-        for user in student_users:
-            print(f"   User ID: {user[0]}, Username: {user[1]}, Email: {user[2]}")
-        
+    elif section == "student":
         # 2. Check Student table and link to users
         print("\n2. Student records linked to users:")
-        cursor.execute("""
-            SELECT s.student_id, s.student_number, s.full_name, s.user_id, u.username, u.email
-            FROM Student s
-            LEFT JOIN users u ON s.user_id = u.id
-            WHERE u.role = 'student' OR s.user_id IS NOT NULL
-        """)
-        students = cursor.fetchall()
-        for student in students:
-            print(f"   Student ID: {student[0]}, Student Number: {student[1]}")
-            print(f"   Name: {student[2]}, User ID: {student[3]}")
-            print(f"   Username: {student[4]}, Email: {student[5]}")
-            print("   ---")
-        
-        # 3. Check CourseEnrollment table
-        print("\n3. All course enrollments:")
-        cursor.execute("""
-            SELECT ce.enrollment_id, ce.student_id, ce.course_id, ce.status, ce.enrolled_at,
-                   s.student_number, s.full_name, s.user_id
-            FROM CourseEnrollment ce
-            LEFT JOIN Student s ON ce.student_id = s.student_id
-            ORDER BY ce.enrolled_at DESC
-        """)
-        enrollments = cursor.fetchall()
-        for enrollment in enrollments:
-            print(f"   Enrollment ID: {enrollment[0]}")
-            print(f"   Student ID in enrollment: {enrollment[1]}")
-            print(f"   Course ID: {enrollment[2]}, Status: {enrollment[3]}")
-            print(f"   Student: {enrollment[6]} ({enrollment[5]}), User ID: {enrollment[7]}")
-            print(f"   Enrolled at: {enrollment[4]}")
-            print("   ---")
-        
-        # 4. Cross-check: Find potential ID mismatches
+    elif section == "enrollment":
+        # 3. Check CourseEnrollment table (newest first, bounded)
+        print(f"\n3. Most recent course enrollments (up to {ENROLLMENT_LISTING_LIMIT}):")
+    elif section == "same_user":
+        # 4. Cross-check: Find potential ID mismatches, starting from the most recent enrollment
         print("\n4. Checking for ID mismatches:")
-        
-        # Get the most recent enrollment
-        if enrollments:
-            recent_enrollment = enrollments[0]
-            enrolled_student_id = recent_enrollment[1]
-            enrolled_user_id = recent_enrollment[7]
-            
-            print(f"   Most recent enrollment uses student_id: {enrolled_student_id}")
-            print(f"   This student_id belongs to user_id: {enrolled_user_id}")
-            
-            # Check if there are other student records for the same user
-            cursor.execute("SELECT student_id, student_number, full_name FROM Student WHERE user_id = ?", (enrolled_user_id,))
-            user_students = cursor.fetchall()
-            print(f"   All student records for user_id {enrolled_user_id}:")
-            for us in user_students:
-                print(f"     student_id: {us[0]}, student_number: {us[1]}, name: {us[2]}")
-        
+        if recent_enrollment is not None:
+            print(f"   Most recent enrollment uses student_id: {recent_enrollment['student_id']}")
+            print(f"   This student_id belongs to user_id: {recent_enrollment['user_id']}")
+            # Other student records for the same user follow
+            print(f"   All student records for user_id {recent_enrollment['user_id']}:")
+    elif section == "orphan":
         # 5. Check if there are students without user_id (potential orphans)
         print("\n5. Students without linked user accounts:")
-        cursor.execute("SELECT student_id, student_number, full_name FROM Student WHERE user_id IS NULL")
-        orphan_students = cursor.fetchall()
-        for orphan in orphan_students:
-            print(f"   Student ID: {orphan[0]}, Number: {orphan[1]}, Name: {orphan[2]}")
-        
-        if not orphan_students:
-            print("   No orphaned students found.")
-        
-        conn.close()
-        
-    except Exception as e:
-        print(f"Error: {e}")
+
+def _debug_enrollment_flow(conn):
+    print("=== DEBUGGING ENROLLMENT FLOW ===\n")
+
+    recent_enrollment = None
+    orphan_students = 0
+    headers_printed = 0
+
+    def open_section(section):
+        # Print this section's header, and those of any empty sections before it
+        nonlocal headers_printed
+        while headers_printed <= SECTIONS.index(section):
+            _print_section_header(SECTIONS[headers_printed], recent_enrollment)
+            headers_printed += 1
+
+    for tag, *values in stream(conn.execute(FLOW_SQL, (ENROLLMENT_LISTING_LIMIT,))):
+        row = dict(zip(FLOW_FIELDS[tag], values))
+        open_section(tag)
+
+        if tag == "user":
+            print(f"   User ID: {row['id']}, Username: {row['username']}, Email: {row['email']}")
+        elif tag == "student":
+            print(f"   Student ID: {row['student_id']}, Student Number: {row['student_number']}")
+            print(f"   Name: {row['full_name']}, User ID: {row['user_id']}")
+            print(f"   Username: {row['username']}, Email: {row['email']}")
+            print("   ---")
+        elif tag == "enrollment":
+            if recent_enrollment is None:
+                recent_enrollment = row
+            print(f"   Enrollment ID: {row['enrollment_id']}")
+            print(f"   Student ID in enrollment: {row['student_id']}")
+            print(f"   Course ID: {row['course_id']}, Status: {row['status']}")
+            print(f"   Student: {row['full_name']} ({row['student_number']}), User ID: {row['user_id']}")
+            print(f"   Enrolled at: {row['enrolled_at']}")
+            print("   ---")
+        elif tag == "same_user":
+            print(f"     student_id: {row['student_id']}, student_number: {row['student_number']}, name: {row['full_name']}")
+        elif tag == "orphan":
+            orphan_students += 1
+            print(f"   Student ID: {row['student_id']}, Number: {row['student_number']}, Name: {row['full_name']}")
+
+    open_section(SECTIONS[-1])
+    if not orphan_students:
+        print("   No orphaned students found.")
 
 if __name__ == "__main__":
     debug_enrollment_flow()
@@ -0,0 +1,161 @@
+"""
+Shared database helpers for the enrollment debug scripts in this directory
+"""
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+# The app's database, next to this module
+DB_PATH = Path(__file__).resolve().parent / "database" / "dentist.db"
+
+# Last good /course-management/courses response, reused by the API scripts while fresh
+COURSES_SNAPSHOT = Path(__file__).resolve().parent / ".cache" / "courses.json"
+SNAPSHOT_MAX_AGE = 60  # seconds
+
+# (connect, read) seconds for every API call, so a hung server fails fast
+HTTP_TIMEOUT = (1.0, 3.0)
+
+
+# Row types returned by the get_* helpers below, in their SELECT column order
+class StudentUserRow(NamedTuple):
+    id: int
+    username: str
+    email: str
+    role: str
+
+
+class StudentRow(NamedTuple):
+    student_id: int
+    student_number: str
+    full_name: str
+    user_id: Optional[int]
+
+
+class EnrollmentRow(NamedTuple):
+    enrollment_id: int
+    student_id: int
+    course_id: int
+    status: str
+    enrolled_at: str
+
+
+# Fixed statement text, so sqlite3's per-connection statement cache reuses the
+# compiled statement on every call. LIMIT -1 means "no limit" in SQLite.
+STUDENT_USERS_SQL = "SELECT id, username, email, role FROM users WHERE role = 'student' ORDER BY id LIMIT ?"
+STUDENTS_SQL = "SELECT student_id, student_number, full_name, user_id FROM Student ORDER BY student_id LIMIT ?"
+ENROLLMENTS_SQL = (
+    "SELECT enrollment_id, student_id, course_id, status, enrolled_at "
+    "FROM CourseEnrollment ORDER BY enrollment_id LIMIT ?"
+)
+
+
+@contextmanager
+def db(readonly=True, snapshot=False):
+    """Open the app's database (read-only unless asked otherwise) with sqlite3.Row rows.
+
+    snapshot=True yields the shared memory_snapshot() connection instead, which
+    stays open for the rest of the process.
+    """
+    if snapshot:
+        yield memory_snapshot()
+        return
+    if readonly:
+        conn = sqlite3.connect(f"{DB_PATH.as_uri()}?mode=ro", uri=True)
+        conn.execute("PRAGMA query_only=1")
+    else:
+        conn = sqlite3.connect(str(DB_PATH))
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # The scripts rescan the same few tables; map the file and keep a large page
+    # cache so later queries are served from memory instead of read() calls
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@lru_cache(maxsize=None)
+def memory_snapshot():
+    """In-memory copy of the student users, Student and CourseEnrollment tables.
+
+    Built once per process; repeated checks in the same run query it instead of
+    the database file. It is not refreshed, so it only suits read-only checks.
+    """
+    conn = sqlite3.connect(":memory:", uri=True)
+    conn.execute("ATTACH DATABASE ? AS src", (f"{DB_PATH.as_uri()}?mode=ro",))
+    conn.execute("CREATE TABLE users AS SELECT * FROM src.users WHERE role = 'student'")
+    conn.execute("CREATE TABLE Student AS SELECT * FROM src.Student")
+    conn.execute("CREATE TABLE CourseEnrollment AS SELECT * FROM src.CourseEnrollment")
+    conn.execute("DETACH DATABASE src")
+    # The join columns the checks use
+    conn.execute("CREATE INDEX ix_student_user ON Student (user_id)")
+    conn.execute("CREATE INDEX ix_enrollment_student ON CourseEnrollment (student_id)")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def stream(cursor, batch=500):
+    """Yield the cursor's rows, fetched `batch` at a time instead of all at once."""
+    while rows := cursor.fetchmany(batch):
+        yield from rows
+
+
+def read_snapshot(path=COURSES_SNAPSHOT, max_age=SNAPSHOT_MAX_AGE):
+    """Parsed JSON saved at `path` if it is younger than `max_age` seconds, else None."""
+    try:
+        if time.time() - path.stat().st_mtime < max_age:
+            return json.loads(path.read_text())
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def write_snapshot(text, path=COURSES_SNAPSHOT):
+    """Save a response body for read_snapshot()."""
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(text)
+
+
+@lru_cache(maxsize=None)
+def http_session():
+    """Keep-alive requests.Session shared by the API scripts, created on first use.
+
+    Gateway errors (502/503/504) are retried twice with a short backoff; pass
+    HTTP_TIMEOUT with each call. requests is imported here rather than at module
+    level, so the database-only checks never pay for importing it.
+    """
+    import requests
+    from urllib3.util import Retry
+
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False)
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+    return session
+
+
+def _fetch(conn, sql, row_type, limit):
+    # Build the row tuples directly; the SELECT lists match the row types' fields
+    cursor = conn.cursor()
+    cursor.row_factory = lambda _cursor, row: row_type(*row)
+    return cursor.execute(sql, (-1 if limit is None else limit,)).fetchall()
+
+
+def get_student_users(conn, limit=None):
+    """Users with the student role, as StudentUserRow tuples."""
+    return _fetch(conn, STUDENT_USERS_SQL, StudentUserRow, limit)
+
+
+def get_students(conn, limit=None):
+    """Student records, as StudentRow tuples."""
+    return _fetch(conn, STUDENTS_SQL, StudentRow, limit)
+
+
+def get_enrollments(conn, limit=None):
+    """Course enrollments, as EnrollmentRow tuples."""
+    return _fetch(conn, ENROLLMENTS_SQL, EnrollmentRow, limit)
@@ -1,8 +1,6 @@
 #!/usr/bin/env python3
 
-import requests
-import json
-import sqlite3
+from debug_lib import HTTP_TIMEOUT, db, http_session, read_snapshot, write_snapshot
 
 # Test the API endpoints and database directly
 BASE_URL = "http://localhost:8000"
@@ -11,41 +9,44 @@ def check_database_directly():
     """Check database for enrollment data"""
     print("=== CHECKING DATABASE DIRECTLY ===")
     try:
-        conn = sqlite3.connect('database/dentist.db')
-        cursor = conn.cursor()
-        
-        # Get student users
-        cursor.execute("SELECT id, username FROM users WHERE role = 'student'")
-        users = cursor.fetchall()
-        print(f"Student users: {len(users)}")
-        
-        # Get student records
-        cursor.execute("SELECT student_id, student_number, user_id FROM Student")
-        students = cursor.fetchall()
-        print(f"Student records: {len(students)}")
-        
-        # Get enrollments
-        cursor.execute("SELECT enrollment_id, student_id, course_id FROM CourseEnrollment")
-        enrollments = cursor.fetchall()
-        print(f"Total enrollments: {len(enrollments)}")
-        
-        if users and students:
-            # Test mapping for first user
-            user_id = users[0][0]
-            username = users[0][1]
-            
-            # Find student record
-            student_record = next((s for s in students if s[2] == user_id), None)
-            if student_record:
-                student_id = student_record[0]
-                student_enrollments = [e for e in enrollments if e[1] == student_id]
-                print(f"\nTest: User '{username}' -> Student ID {student_id} -> {len(student_enrollments)} enrollments")
-                return student_id, len(student_enrollments) > 0
-            else:
-                print(f"\nISSUE: User '{username}' has no student record")
-                return None, False
-        
-        conn.close()
+        with db(snapshot=True) as conn:
+            cursor = conn.cursor()
+
+            # Table sizes
+            cursor.execute("""
+                SELECT (SELECT COUNT(*) FROM users WHERE role = 'student') AS user_count,
+                       (SELECT COUNT(*) FROM Student) AS student_count,
+                       (SELECT COUNT(*) FROM CourseEnrollment) AS enrollment_count
+            """)
+            counts = cursor.fetchone()
+            user_count = counts['user_count']
+            student_count = counts['student_count']
+            enrollment_count = counts['enrollment_count']
+            print(f"Student users: {user_count}")
+            print(f"Student records: {student_count}")
+            print(f"Total enrollments: {enrollment_count}")
+
+            if user_count and student_count:
+                # Test mapping for first user: user -> student record -> enrollments, joined in SQL
+                cursor.execute("""
+                    SELECT u.username, s.student_id, COUNT(ce.enrollment_id) AS enrollment_count
+                    FROM users u
+                    LEFT JOIN Student s ON s.user_id = u.id
+                    LEFT JOIN CourseEnrollment ce ON ce.student_id = s.student_id
+                    WHERE u.id = (SELECT MIN(id) FROM users WHERE role = 'student')
+                    GROUP BY u.id, s.student_id
+                """)
+                row = cursor.fetchone()
+                username = row['username']
+                student_id = row['student_id']
+                student_enrollments = row['enrollment_count']
+                if student_id is not None:
+                    print(f"\nTest: User '{username}' -> Student ID {student_id} -> {student_enrollments} enrollments")
+                    return student_id, student_enrollments > 0
+                else:
+                    print(f"\nISSUE: User '{username}' has no student record")
+                    return None, False
+
         return None, False
         
     except Exception as e:
@@ -55,7 +56,7 @@ def check_database_directly():
 def test_api_health():
     """Test if API is accessible"""
     try:
-        response = requests.get(f"{BASE_URL}/docs", timeout=5)
+        response = http_session().head(f"{BASE_URL}/docs", timeout=HTTP_TIMEOUT)
         print(f"API Health: {response.status_code}")
         return response.status_code == 200
     except Exception as e:
@@ -64,11 +65,17 @@ def test_api_health():
 
 def test_courses_endpoint():
     """Test courses endpoint"""
+    courses = read_snapshot()
+    if courses is not None:
+        print("Courses endpoint: cached snapshot")
+        print(f"Available courses: {len(courses)}")
+        return len(courses) > 0
     try:
-        response = requests.get(f"{BASE_URL}/course-management/courses")
+        response = http_session().get(f"{BASE_URL}/course-management/courses", timeout=HTTP_TIMEOUT)
         print(f"Courses endpoint: {response.status_code}")
         if response.status_code == 200:
             courses = response.json()
+            write_snapshot(response.text)
             print(f"Available courses: {len(courses)}")
             return len(courses) > 0
         return False
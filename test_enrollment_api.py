@@ -1,6 +1,4 @@
-import requests
-import json
-import sqlite3
+from debug_lib import HTTP_TIMEOUT, db, get_enrollments, get_student_users, get_students, http_session
 
 # Test the enrollment API endpoints
 BASE_URL = "http://localhost:8000"
@@ -9,44 +7,40 @@ def test_database_direct():
     """Check database directly"""
     print("=== DIRECT DATABASE CHECK ===")
     try:
-        conn = sqlite3.connect('database/dentist.db')
-        cursor = conn.cursor()
-        
-        # Check users
-        cursor.execute("SELECT id, username, role FROM users WHERE role = 'student'")
-        users = cursor.fetchall()
-        print(f"Student users: {len(users)}")
-        for user in users:
-            print(f"  User ID: {user[0]}, Username: {user[1]}")
-        
-        # Check students
-        cursor.execute("SELECT student_id, student_number, full_name, user_id FROM Student")
-        students = cursor.fetchall()
-        print(f"Student records: {len(students)}")
-        for student in students:
-            print(f"  Student ID: {student[0]}, Number: {student[1]}, User ID: {student[3]}")
-        
-        # Check enrollments
-        cursor.execute("SELECT enrollment_id, student_id, course_id, status FROM CourseEnrollment")
-        enrollments = cursor.fetchall()
-        print(f"Enrollments: {len(enrollments)}")
-        for enrollment in enrollments:
-            print(f"  Enrollment: {enrollment[0]}, Student ID: {enrollment[1]}, Course: {enrollment[2]}")
-        
-        # Check mapping
-        if users and students:
-            user_id = users[0][0]
-            student_record = next((s for s in students if s[3] == user_id), None)
-            if student_record:
-                student_id = student_record[0]
-                student_enrollments = [e for e in enrollments if e[1] == student_id]
-                print(f"\nMapping check:")
-                print(f"  User ID {user_id} -> Student ID {student_id}")
-                print(f"  Enrollments for Student ID {student_id}: {len(student_enrollments)}")
-            else:
-                print(f"\nISSUE: User ID {user_id} has no Student record!")
-        
-        conn.close()
+        with db(snapshot=True) as conn:
+            # Check users
+            users = get_student_users(conn)
+            print(f"Student users: {len(users)}")
+            for user in users:
+                print(f"  User ID: {user.id}, Username: {user.username}")
+
+            # Check students
+            students = get_students(conn)
+            print(f"Student records: {len(students)}")
+            for student in students:
+                print(f"  Student ID: {student.student_id}, Number: {student.student_number}, User ID: {student.user_id}")
+
+            # Check enrollments
+            enrollments = get_enrollments(conn)
+            print(f"Enrollments: {len(enrollments)}")
+            for enrollment in enrollments:
+                print(f"  Enrollment: {enrollment.enrollment_id}, Student ID: {enrollment.student_id}, Course: {enrollment.course_id}")
+
+            # Check mapping
+            if users and students:
+                user_id = users[0].id
+                # user_id -> Student row, built once from the rows already fetched
+                student_by_user = {s.user_id: s for s in students if s.user_id is not None}
+                student_record = student_by_user.get(user_id)
+                if student_record:
+                    student_id = student_record.student_id
+                    student_enrollments = [e for e in enrollments if e.student_id == student_id]
+                    print(f"\nMapping check:")
+                    print(f"  User ID {user_id} -> Student ID {student_id}")
+                    print(f"  Enrollments for Student ID {student_id}: {len(student_enrollments)}")
+                else:
+                    print(f"\nISSUE: User ID {user_id} has no Student record!")
+
         return users, students, enrollments
         
     except Exception as e:
@@ -59,7 +53,7 @@ def test_api_endpoints():
     
     # Test if server is running
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=2)
+        response = http_session().get(f"{BASE_URL}/health", timeout=HTTP_TIMEOUT)
         print("Server is running")
     except:
         print("Server is not running - skipping API tests")
@@ -3,8 +3,8 @@
 Test the complete enrollment flow to identify the issue
 """
 import requests
-import json
-import time
+
+from debug_lib import HTTP_TIMEOUT, http_session, read_snapshot, write_snapshot
 
 BASE_URL = "http://localhost:8000"
 
@@ -13,28 +13,32 @@ def test_enrollment_flow():
     
     # Test 1: Check if server is running
     try:
-        response = requests.get(f"{BASE_URL}/docs", timeout=5)
+        response = http_session().head(f"{BASE_URL}/docs", timeout=HTTP_TIMEOUT)
         print("✓ Backend server is running")
     except requests.exceptions.RequestException as e:
         print(f"✗ Backend server not accessible: {e}")
         return False
     
-    # Test 2: Try to get available courses
+    # Test 2: Try to get available courses (a fresh snapshot skips the request)
     try:
-        response = requests.get(f"{BASE_URL}/course-management/courses")
-        if response.status_code == 200:
-            courses = response.json()
+        courses = read_snapshot()
+        if courses is None:
+            response = http_session().get(f"{BASE_URL}/course-management/courses", timeout=HTTP_TIMEOUT)
+            if response.status_code == 200:
+                courses = response.json()
+                write_snapshot(response.text)
+            else:
+                print(f"✗ Failed to get courses: {response.status_code}")
+        if courses is not None:
             print(f"✓ Found {len(courses)} available courses")
             if courses:
                 print(f"  Sample course: {courses[0].get('title', 'Unknown')} (ID: {courses[0].get('course_id', 'Unknown')})")
-        else:
-            print(f"✗ Failed to get courses: {response.status_code}")
     except Exception as e:
         print(f"✗ Error getting courses: {e}")
     
     # Test 3: Try to get students (this might require authentication)
     try:
-        response = requests.get(f"{BASE_URL}/doctor/students")
+        response = http_session().get(f"{BASE_URL}/doctor/students", timeout=HTTP_TIMEOUT)
         if response.status_code == 200:
             students = response.json()
             print(f"✓ Found {len(students)} students")